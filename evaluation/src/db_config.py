@@ -4,6 +4,7 @@ This file contains the centralized database configuration that should be used ac
 """
 
 import os
+from dataclasses import dataclass, fields, replace
 
 # Default settings
 DEFAULT_HOST = 'livesqlbench_postgresql'  # Default container hostname
@@ -15,16 +16,32 @@ DEFAULT_PASSWORD = (
 )
 DEFAULT_MINCONN = 1
 DEFAULT_MAXCONN = 5
+# CREATE DATABASE ... STRATEGY used to clone templates on PostgreSQL 15+.
+# "wal_log" (the server default) suits small templates; "file_copy" copies the
+# data files directly and is faster on large ones, and on PostgreSQL 18 with
+# file_copy_method = clone it becomes a reflink copy on CoW filesystems
+# (XFS, Btrfs, ZFS). An empty value leaves the choice to the server.
+DEFAULT_TEMPLATE_STRATEGY = os.getenv('LIVESQLBENCH_PG_TEMPLATE_STRATEGY', 'wal_log')
 
-# Global configuration override
-GLOBAL_CONFIG = {
-    'host': DEFAULT_HOST,  # Default to container hostname
-    'port': DEFAULT_PORT,
-    'user': DEFAULT_USER,
-    'password': DEFAULT_PASSWORD,
-    'minconn': DEFAULT_MINCONN,
-    'maxconn': DEFAULT_MAXCONN,
-}
+
+@dataclass(frozen=True, slots=True)
+class DbConfig:
+    """
+    Immutable snapshot of the database settings.
+    """
+    host: str = DEFAULT_HOST
+    port: int = DEFAULT_PORT
+    user: str = DEFAULT_USER
+    password: str = DEFAULT_PASSWORD
+    minconn: int = DEFAULT_MINCONN
+    maxconn: int = DEFAULT_MAXCONN
+    template_strategy: str = DEFAULT_TEMPLATE_STRATEGY
+
+
+# Global configuration override. Writers publish a new snapshot with a single
+# assignment, so readers never need to copy or lock it.
+GLOBAL_CONFIG = DbConfig()
+_VALID_KEYS = tuple(field.name for field in fields(DbConfig))
 
 def set_global_db_config(**kwargs):
     """
@@ -32,7 +49,8 @@ def set_global_db_config(**kwargs):
     
     Args:
         **kwargs: Database configuration parameters to set globally.
-                 Valid keys: 'host', 'port', 'user', 'password', 'minconn', 'maxconn'
+                 Valid keys: 'host', 'port', 'user', 'password', 'minconn', 'maxconn',
+                 'template_strategy'
                  
     Examples:
         # Use localhost
@@ -45,29 +63,22 @@ def set_global_db_config(**kwargs):
         set_global_db_config(user='custom_user', password='custom_pass')
     """
     global GLOBAL_CONFIG
+    for key in kwargs:
+        if key not in _VALID_KEYS:
+            raise ValueError(f"Invalid configuration key: {key}. Valid keys are: {list(_VALID_KEYS)}")
+    GLOBAL_CONFIG = replace(GLOBAL_CONFIG, **kwargs)
     for key, value in kwargs.items():
-        if key in GLOBAL_CONFIG:
-            GLOBAL_CONFIG[key] = value
-            print(f"set_global_db_config: {key} = {value}")
-        else:
-            raise ValueError(f"Invalid configuration key: {key}. Valid keys are: {list(GLOBAL_CONFIG.keys())}")
-    # import pdb; pdb.set_trace()
+        print(f"set_global_db_config: {key} = {value}")
 
 def reset_global_db_config():
     """
     Reset all global database configuration parameters to their default values.
     """
     global GLOBAL_CONFIG
-    GLOBAL_CONFIG = {
-        'host': DEFAULT_HOST,
-        'port': DEFAULT_PORT,
-        'user': DEFAULT_USER,
-        'password': DEFAULT_PASSWORD,
-        'minconn': DEFAULT_MINCONN,
-        'maxconn': DEFAULT_MAXCONN,
-    }
+    GLOBAL_CONFIG = DbConfig()
 
-def get_db_config(host=None, port=None, user=None, password=None, minconn=None, maxconn=None):
+def get_db_config(host=None, port=None, user=None, password=None, minconn=None, maxconn=None,
+                  template_strategy=None):
     """
     Get database configuration.
     
@@ -78,9 +89,10 @@ def get_db_config(host=None, port=None, user=None, password=None, minconn=None,
         password (str): If provided, overrides the global password setting
         minconn (int): If provided, overrides the global minconn setting
         maxconn (int): If provided, overrides the global maxconn setting
+        template_strategy (str): If provided, overrides the global template_strategy setting
     
     Returns:
-        dict: Database configuration dictionary with all settings
+        DbConfig: Immutable database configuration with all settings
     
     Examples:
         # Get configuration with global settings
@@ -89,21 +101,20 @@ def get_db_config(host=None, port=None, user=None, password=None, minconn=None,
         # Override specific settings
         config = get_db_config(host='localhost', port=5433)
     """
-    # Start with a copy of the global configuration
-    config = GLOBAL_CONFIG.copy()
-    
-    # Override with any explicitly provided parameters
-    if host is not None:
-        config['host'] = host
-    if port is not None:
-        config['port'] = port
-    if user is not None:
-        config['user'] = user
-    if password is not None:
-        config['password'] = password
-    if minconn is not None:
-        config['minconn'] = minconn
-    if maxconn is not None:
-        config['maxconn'] = maxconn
-        
-    return config 
\ No newline at end of file
+    overrides = {
+        key: value
+        for key, value in (
+            ('host', host),
+            ('port', port),
+            ('user', user),
+            ('password', password),
+            ('minconn', minconn),
+            ('maxconn', maxconn),
+            ('template_strategy', template_strategy),
+        )
+        if value is not None
+    }
+    if not overrides:
+        # The global snapshot is immutable, so it can be shared as-is
+        return GLOBAL_CONFIG
+    return replace(GLOBAL_CONFIG, **overrides)
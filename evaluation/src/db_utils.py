@@ -1,74 +1,229 @@
 # db_utils.py
-import os
-import subprocess
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
 import psycopg2
 from db_config import get_db_config
 from logger import PrintLogger, log_section_footer, log_section_header
-from psycopg2 import OperationalError
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2 import OperationalError, sql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+from psycopg2.pool import PoolError
 
 _postgresql_pools = {}
+# libpq TCP keepalive settings shared by every pooled connection, so a dead
+# server or dropped link fails fast instead of hanging a worker on a stale socket
+_KEEPALIVE_KWARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 5,
+    "keepalives_count": 3,
+    "tcp_user_timeout": 10000,
+}
+# Per-thread single-slot cache of (db_name, pool) for _get_or_init_pool
+_last_pool = threading.local()
+
+
+class PostgreSQLConnectionPool:
+    """
+    Thread-safe connection pool shared by the evaluation worker threads.
+
+    Idle connections live in a collections.deque used as a stack: append/pop are
+    atomic without a Python-level lock, so getconn/putconn never serialize the
+    workers, and the most recently returned connection is handed out first so
+    its backend's caches stay warm. Only the bookkeeping for opening a
+    brand-new connection takes a lock, and the (slow) connect itself happens
+    outside of it. maxconn=None leaves the pool unbounded.
+    """
+
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.closed = False
+        self._kwargs = kwargs
+        self._idle = deque()
+        self._used = set()
+        self._size = 0
+        self._size_lock = threading.Lock()
+
+        for _ in range(minconn):
+            self._reserve_slot()
+            self._idle.append(self._connect())
+
+    def _reserve_slot(self):
+        with self._size_lock:
+            if self.maxconn is not None and self._size >= self.maxconn:
+                raise PoolError("connection pool exhausted")
+            self._size += 1
+
+    def _release_slot(self):
+        with self._size_lock:
+            self._size -= 1
+
+    def _connect(self):
+        try:
+            return psycopg2.connect(**self._kwargs)
+        except Exception:
+            self._release_slot()
+            raise
+
+    def getconn(self):
+        """
+        Borrow a connection, opening a new one if no idle connection is available.
+        """
+        if self.closed:
+            raise PoolError("connection pool is closed")
+        try:
+            conn = self._idle.pop()
+        except IndexError:
+            self._reserve_slot()
+            conn = self._connect()
+        self._used.add(conn)
+        return conn
+
+    def putconn(self, conn, close=False):
+        """
+        Return a connection to the pool, rolling back any open transaction.
+        """
+        self._used.discard(conn)
+        if self.closed:
+            # closeall() already reset the bookkeeping
+            if not conn.closed:
+                conn.close()
+            return
+        if not conn.closed and not close:
+            status = conn.info.transaction_status
+            if status == TRANSACTION_STATUS_UNKNOWN:
+                # Connection is broken, do not hand it out again
+                close = True
+            elif status != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        if close or conn.closed:
+            if not conn.closed:
+                conn.close()
+            self._release_slot()
+            return
+        self._idle.append(conn)
+
+    def closeall(self):
+        """
+        Close every connection owned by the pool, idle or borrowed.
+        """
+        self.closed = True
+        conns = list(self._used)
+        self._used.clear()
+        while True:
+            try:
+                conns.append(self._idle.pop())
+            except IndexError:
+                break
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._size_lock:
+            self._size = 0
 
 
 def _get_or_init_pool(db_name):
     """
     Returns a connection pool for the given database name, creating one if it does not exist.
     """
-    if db_name not in _postgresql_pools:
-        config = get_db_config().copy()
-        config.update({"dbname": db_name})
-        _postgresql_pools[db_name] = SimpleConnectionPool(
-            config["minconn"],
-            config["maxconn"],
-            dbname=config["dbname"],
-            user=config["user"],
-            password=config["password"],
-            host=config["host"],
-            port=config["port"],
+    # Each worker thread sticks to one ephemeral db, so remember the last pool it used
+    last = getattr(_last_pool, "entry", None)
+    if last is not None and last[0] == db_name and not last[1].closed:
+        return last[1]
+
+    pool = _postgresql_pools.get(db_name)
+    if pool is None:
+        config = get_db_config()
+        new_pool = PostgreSQLConnectionPool(
+            config.minconn,
+            config.maxconn,
+            dbname=db_name,
+            user=config.user,
+            password=config.password,
+            host=config.host,
+            port=config.port,
+            # 60s query timeout, applied once at session start instead of per query
+            options="-c statement_timeout=60s",
+            **_KEEPALIVE_KWARGS,
         )
-    return _postgresql_pools[db_name]
+        # setdefault is atomic: if another thread registered a pool meanwhile, use
+        # theirs and discard ours instead of leaking a second pool for the db.
+        pool = _postgresql_pools.setdefault(db_name, new_pool)
+        if pool is not new_pool:
+            new_pool.closeall()
+    _last_pool.entry = (db_name, pool)
+    return pool
+
+
+# Query kinds are matched in place with case-insensitive patterns, so the hot
+# path never builds stripped or lower-cased copies of (possibly large) SQL text.
+# Statements that only read; see perform_query_on_cursor
+_READ_START_RE = re.compile(
+    r"\s*(?:select|with|show|explain|table|values)\b", re.IGNORECASE
+)
+
+# Keywords that let a read-looking statement change the database: SELECT ... INTO,
+# data-modifying CTEs, EXPLAIN ANALYZE of a write, sequence functions, DO blocks.
+_WRITE_RE = re.compile(
+    r"\b(?:insert|update|delete|merge|into|create|drop|alter|truncate|copy|call|do"
+    r"|lock|nextval|setval|pg_advisory\w*|pg_notify|lo_\w+|dblink\w*)\b",
+    re.IGNORECASE,
+)
+
+
+def _is_read(query):
+    """
+    True if the query starts with a read-only statement keyword.
+    """
+    return _READ_START_RE.match(query) is not None
 
 
-def perform_query_on_postgresql_databases(query, db_name, conn=None):
+def queries_are_read_only(queries):
     """
-    Executes the given query on the specified database, returns (result, conn).
-    Automatically commits if the query is recognized as a write operation.
+    Conservatively decide from the SQL text alone whether the queries leave the
+    database unchanged. User-defined functions with side effects called from a
+    SELECT are not detected, so callers must treat a True result as a hint only.
+    """
+    for query in queries:
+        if not _is_read(query) or _WRITE_RE.search(query):
+            return False
+    return True
+
+
+def perform_query_on_cursor(cursor, query):
+    """
+    Executes the given query on an already-open cursor and returns the result.
+    Automatically commits if the query succeeds and rolls back if it fails.
+
+    Reads run in autocommit mode, which skips the BEGIN and COMMIT round trips;
+    a statement sent on its own is committed the same way either way.
 
     Returns:
-        (result, conn):
-            result: list of tuples, each tuple is a row of the result
-            conn: the connection used to execute the query
+        result: list of tuples, each tuple is a row of the result
     """
     MAX_ROWS = 10000
-    pool = _get_or_init_pool(db_name)
-    need_to_put_back = False
-
-    if conn is None:
-        conn = pool.getconn()
-        need_to_put_back = True
+    conn = cursor.connection
 
-    cursor = conn.cursor()
-    cursor.execute("SET statement_timeout = '60s';")  # 60s query timeout
+    # Only switch when no transaction is open, so explicit BEGIN blocks still hold
+    autocommit_read = (
+        not conn.autocommit
+        and _is_read(query)
+        and conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+    )
 
     try:
+        if autocommit_read:
+            conn.autocommit = True
         cursor.execute(query)
-        lower_q = query.strip().lower()
-        conn.commit()
-
-        # if lower_q.startswith("select") or lower_q.startswith("with"):
-        #     # Fetch up to MAX_ROWS + 1 to see if there's an overflow
-        #     rows = cursor.fetchmany(MAX_ROWS + 1)
-        #     if len(rows) > MAX_ROWS:
-        #         rows = rows[:MAX_ROWS]
-        #     result = rows
-        # else:
-        #     try:
-        #         result = cursor.fetchall()
-        #     except psycopg2.ProgrammingError:
-        #         result = None
-
-        # return (result, conn)
+
+        if not autocommit_read:
+            conn.commit()
         try:
             rows = cursor.fetchmany(MAX_ROWS + 1)
             if len(rows) > MAX_ROWS:
@@ -76,13 +231,37 @@ def perform_query_on_postgresql_databases(query, db_name, conn=None):
             result = rows
         except psycopg2.ProgrammingError:
             result = None
-        return (result, conn)
+        return result
 
     except Exception as e:
         conn.rollback()
         raise e
     finally:
-        cursor.close()
+        if autocommit_read and not conn.closed:
+            conn.autocommit = False
+
+
+def perform_query_on_postgresql_databases(query, db_name, conn=None):
+    """
+    Executes the given query on the specified database, returns (result, conn).
+    Opens a cursor for this single query; see perform_query_on_cursor.
+
+    Returns:
+        (result, conn):
+            result: list of tuples, each tuple is a row of the result
+            conn: the connection used to execute the query
+    """
+    pool = _get_or_init_pool(db_name)
+    need_to_put_back = False
+
+    if conn is None:
+        conn = pool.getconn()
+        need_to_put_back = True
+
+    try:
+        with conn.cursor() as cursor:
+            return (perform_query_on_cursor(cursor, query), conn)
+    finally:
         if need_to_put_back:
             # If you only need a single query, you could return it right away:
             # But usually, we keep the same conn for subsequent queries, so do nothing.
@@ -95,8 +274,8 @@ def close_postgresql_connection(db_name, conn):
     """
     Release a connection back to the pool when you are done with it.
     """
-    if db_name in _postgresql_pools:
-        pool = _postgresql_pools[db_name]
+    pool = _postgresql_pools.get(db_name)
+    if pool is not None:
         pool.putconn(conn)
 
 
@@ -104,27 +283,129 @@ def close_all_postgresql_pools():
     """
     Closes all connections in all pools (e.g., at application shutdown).
     """
-    for pool in _postgresql_pools.values():
+    # Snapshot first: other threads may add or remove pools while we iterate
+    for db_name, pool in list(_postgresql_pools.items()):
+        _postgresql_pools.pop(db_name, None)
+        pool.closeall()
+    for pg_password, pool in list(_admin_pools.items()):
+        _admin_pools.pop(pg_password, None)
         pool.closeall()
-    _postgresql_pools.clear()
 
 
 def close_postgresql_pool(db_name):
     """
     Close the pool for a specific db_name and remove its reference.
     """
-    if db_name in _postgresql_pools:
-        pool = _postgresql_pools.pop(db_name)
+    pool = _postgresql_pools.pop(db_name, None)
+    if pool is not None:
         pool.closeall()
 
 
 def get_connection_for_phase(db_name, logger):
     """
     Acquire a new connection (borrowed from the connection pool) for a specific phase.
+    Pooled connections already carry the 60s statement_timeout.
+    """
+    logger.info("Acquiring dedicated connection for phase on db: %s", db_name)
+    return _get_or_init_pool(db_name).getconn()
+
+
+def reset_session(conn):
+    """
+    Bring a connection back to the state of a fresh one between phases: roll back
+    any open transaction, then DISCARD ALL to drop temp tables, prepared
+    statements and SET values (the startup statement_timeout is kept).
+    """
+    conn.rollback()
+    autocommit = conn.autocommit
+    # DISCARD ALL cannot run inside a transaction block
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DISCARD ALL")
+    finally:
+        conn.autocommit = autocommit
+
+
+@contextmanager
+def phase_connection(db_name, logger):
+    """
+    Borrow a connection for a phase and always give it back to the pool, even when
+    the phase raises.
     """
-    logger.info(f"Acquiring dedicated connection for phase on db: {db_name}")
-    result, conn = perform_query_on_postgresql_databases("SELECT 1", db_name, conn=None)
-    return conn
+    conn = get_connection_for_phase(db_name, logger)
+    try:
+        yield conn
+    finally:
+        close_postgresql_connection(db_name, conn)
+
+
+# Admin connections to the maintenance db, keyed by password
+_admin_pools = {}
+
+
+def _get_admin_pool(pg_password):
+    """
+    Returns the pool of connections to the "postgres" maintenance database used
+    to create, drop and reset databases, creating it if it does not exist.
+    """
+    pool = _admin_pools.get(pg_password)
+    if pool is None:
+        config = get_db_config()
+        new_pool = PostgreSQLConnectionPool(
+            0,
+            # Every worker thread may reset its database at the same time
+            None,
+            dbname="postgres",
+            user=config.user,
+            password=pg_password,
+            host=config.host,
+            port=config.port,
+            **_KEEPALIVE_KWARGS,
+        )
+        pool = _admin_pools.setdefault(pg_password, new_pool)
+        if pool is not new_pool:
+            new_pool.closeall()
+    return pool
+
+
+@contextmanager
+def _admin_cursor(pg_password):
+    """
+    Borrow an autocommit cursor on the maintenance database; CREATE/DROP DATABASE
+    cannot run inside a transaction block.
+    """
+    pool = _get_admin_pool(pg_password)
+    conn = pool.getconn()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            yield cursor
+    finally:
+        pool.putconn(conn)
+
+
+def _drop_database_sql(db_name):
+    return sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(db_name))
+
+
+_TEMPLATE_STRATEGIES = ("wal_log", "file_copy")
+
+
+def _create_database_sql(db_name, template_db_name, server_version):
+    query = sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+        sql.Identifier(db_name), sql.Identifier(template_db_name)
+    )
+    strategy = get_db_config().template_strategy.lower()
+    # STRATEGY only exists since PostgreSQL 15
+    if strategy and server_version >= 150000:
+        if strategy not in _TEMPLATE_STRATEGIES:
+            raise ValueError(
+                f"Invalid template strategy: {strategy}. "
+                f"Valid strategies are: {list(_TEMPLATE_STRATEGIES)}"
+            )
+        query += sql.SQL(" STRATEGY {}").format(sql.SQL(strategy))
+    return query
 
 
 def reset_and_restore_database(db_name, pg_password, logger):
@@ -132,116 +413,67 @@ def reset_and_restore_database(db_name, pg_password, logger):
     Resets the database by dropping it and re-creating it from its template.
     1) close pool
     2) terminate connections
-    3) dropdb
-    4) createdb --template ...
+    3) drop database
+    4) create database ... template ...
     """
-    pg_host = get_db_config()["host"]
-    pg_port = get_db_config()["port"]
-    pg_user = get_db_config()["user"]
-
-    env_vars = os.environ.copy()
-    env_vars["PGPASSWORD"] = pg_password
     base_db_name = db_name.split("_process_")[0]
     template_db_name = f"{base_db_name}_template"
 
-    logger.info(f"Resetting database {db_name} using template {template_db_name}")
+    logger.info("Resetting database %s using template %s", db_name, template_db_name)
 
     # 1) Close the pool
-    logger.info(f"Closing connection pool for database {db_name} before resetting.")
+    logger.info("Closing connection pool for database %s before resetting.", db_name)
     close_postgresql_pool(db_name)
 
-    # 2) Terminate existing connections
-    terminate_command = [
-        "psql",
-        "-h",
-        pg_host,
-        "-p",
-        str(pg_port),
-        "-U",
-        pg_user,
-        "-d",
-        "postgres",
-        "-c",
-        f"""
-        SELECT pg_terminate_backend(pid)
-        FROM pg_stat_activity
-        WHERE datname = '{db_name}' AND pid <> pg_backend_pid();
-        """,
-    ]
-    try:
-        subprocess.run(
-            terminate_command,
-            check=True,
-            env=env_vars,
-            timeout=60,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        logger.info(f"All connections to database {db_name} have been terminated.")
-    except subprocess.CalledProcessError as e:
-        logger.warning(
-            "Failed to terminate connections for %s (continuing): %s",
-            db_name,
-            e,
-        )
-
-    # 3) dropdb
-        drop_command = [
-            "dropdb",
-            "--if-exists",
-            "-h",
-            pg_host,
-            "-p",
-            str(pg_port),
-            "-U",
-            pg_user,
-            db_name,
-        ]
+    with _admin_cursor(pg_password) as cursor:
+        # 2) Terminate existing connections
         try:
-            subprocess.run(
-                drop_command,
-                check=True,
-                env=env_vars,
-                timeout=60,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            cursor.execute(
+                """
+                SELECT pg_terminate_backend(pid)
+                FROM pg_stat_activity
+                WHERE datname = %s AND pid <> pg_backend_pid();
+                """,
+                (db_name,),
+            )
+            logger.info("All connections to database %s have been terminated.", db_name)
+        except psycopg2.Error as e:
+            logger.warning(
+                "Failed to terminate connections for %s (continuing): %s",
+                db_name,
+                e,
             )
-            logger.info(f"Database {db_name} dropped if it existed.")
-        except subprocess.CalledProcessError as e:
+
+        # 3) drop database
+        try:
+            cursor.execute(_drop_database_sql(db_name))
+            logger.info("Database %s dropped if it existed.", db_name)
+        except psycopg2.Error as e:
             logger.warning("Failed to drop database %s (continuing): %s", db_name, e)
 
-    # 4) createdb --template=xxx_template
-    create_command = [
-        "createdb",
-        "-h",
-        pg_host,
-        "-p",
-        str(pg_port),
-        "-U",
-        pg_user,
-        db_name,
-        "--template",
-        template_db_name,
-    ]
-    try:
-        subprocess.run(
-            create_command,
-            check=True,
-            env=env_vars,
-            timeout=60,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        logger.info(
-            f"Database {db_name} created from template {template_db_name} successfully."
-        )
-    except subprocess.CalledProcessError as e:
-        logger.warning(
-            "Failed to create database %s from template %s (continuing): %s",
-            db_name,
-            template_db_name,
-            e,
-        )
+        # 4) create database ... template xxx_template
+        try:
+            cursor.execute(
+                _create_database_sql(
+                    db_name, template_db_name, cursor.connection.server_version
+                )
+            )
+            logger.info(
+                "Database %s created from template %s successfully.",
+                db_name,
+                template_db_name,
+            )
+        except psycopg2.Error as e:
+            logger.warning(
+                "Failed to create database %s from template %s (continuing): %s",
+                db_name,
+                template_db_name,
+                e,
+            )
+
+
+# Upper bound on concurrent admin sessions used to clone/drop ephemeral databases
+MAX_ADMIN_WORKERS = 8
 
 
 def create_ephemeral_db_copies(base_db_names, num_copies, pg_password, logger):
@@ -249,69 +481,42 @@ def create_ephemeral_db_copies(base_db_names, num_copies, pg_password, logger):
     For each base database in base_db_names, create `num_copies` ephemeral DB copies
     from base_db_template. Return a dict: {base_db: [ephemeral1, ephemeral2, ...], ...}
     """
-    pg_host = get_db_config()["host"]
-    pg_port = get_db_config()["port"]
-    pg_user = get_db_config()["user"]
-    env_vars = os.environ.copy()
-    env_vars["PGPASSWORD"] = pg_password
-
-    ephemeral_db_pool = {}
-
-    for base_db in base_db_names:
-        base_template = f"{base_db}_template"
-        ephemeral_db_pool[base_db] = []
-
-        for i in range(1, num_copies + 1):
-            ephemeral_name = f"{base_db}_process_{i}"
-            # If it already exists, drop it first
-            drop_cmd = [
-                "dropdb",
-                "--if-exists",
-                "-h",
-                pg_host,
-                "-p",
-                str(pg_port),
-                "-U",
-                pg_user,
-                ephemeral_name,
-            ]
-            subprocess.run(
-                drop_cmd,
-                check=False,
-                env=env_vars,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
 
-            # createdb
-            create_cmd = [
-                "createdb",
-                "-h",
-                pg_host,
-                "-p",
-                str(pg_port),
-                "-U",
-                pg_user,
-                ephemeral_name,
-                "--template",
-                base_template,
-            ]
-            logger.info(
-                f"Creating ephemeral db {ephemeral_name} from {base_template}..."
-            )
-            subprocess.run(
-                create_cmd,
-                check=True,
-                env=env_vars,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+    def _create_copy(base_template, ephemeral_name):
+        logger.info(
+            "Creating ephemeral db %s from %s...", ephemeral_name, base_template
+        )
+        # Each copy gets its own admin connection: drop any leftover, then clone
+        with _admin_cursor(pg_password) as cursor:
+            cursor.execute(_drop_database_sql(ephemeral_name))
+            cursor.execute(
+                _create_database_sql(
+                    ephemeral_name, base_template, cursor.connection.server_version
+                )
             )
 
-            ephemeral_db_pool[base_db].append(ephemeral_name)
+    ephemeral_db_pool = {
+        base_db: [f"{base_db}_process_{i}" for i in range(1, num_copies + 1)]
+        for base_db in base_db_names
+    }
+    copies = [
+        (f"{base_db}_template", ephemeral_name)
+        for base_db, ephemeral_names in ephemeral_db_pool.items()
+        for ephemeral_name in ephemeral_names
+    ]
+    if not copies:
+        return ephemeral_db_pool
 
-        logger.info(
-            f"For base_db={base_db}, ephemeral db list = {ephemeral_db_pool[base_db]}"
-        )
+    # Template clones are file-copy bound on the server, so overlap all of them
+    with ThreadPoolExecutor(
+        max_workers=min(len(copies), MAX_ADMIN_WORKERS)
+    ) as executor:
+        futures = [executor.submit(_create_copy, *copy) for copy in copies]
+        for fut in as_completed(futures):
+            fut.result()
+
+    for base_db, ephemeral_names in ephemeral_db_pool.items():
+        logger.info("For base_db=%s, ephemeral db list = %s", base_db, ephemeral_names)
 
     return ephemeral_db_pool
 
@@ -320,45 +525,159 @@ def drop_ephemeral_dbs(ephemeral_db_pool_dict, pg_password, logger):
     """
     Delete all ephemeral databases created during the script execution.
     """
-    pg_host = get_db_config()["host"]
-    pg_port = get_db_config()["port"]
-    pg_user = get_db_config()["user"]
-    env_vars = os.environ.copy()
-    env_vars["PGPASSWORD"] = pg_password
+
+    def _drop_copy(ephemeral_db):
+        logger.info("Dropping ephemeral db: %s", ephemeral_db)
+        with _admin_cursor(pg_password) as cursor:
+            cursor.execute(_drop_database_sql(ephemeral_db))
 
     logger.info("=== Cleaning up ephemeral databases ===")
-    for base_db, ephemeral_list in ephemeral_db_pool_dict.items():
-        for ephemeral_db in ephemeral_list:
-            logger.info(f"Dropping ephemeral db: {ephemeral_db}")
-            drop_cmd = [
-                "dropdb",
-                "--if-exists",
-                "-h",
-                pg_host,
-                "-p",
-                str(pg_port),
-                "-U",
-                pg_user,
-                ephemeral_db,
-            ]
+    ephemeral_dbs = [
+        ephemeral_db
+        for ephemeral_list in ephemeral_db_pool_dict.values()
+        for ephemeral_db in ephemeral_list
+    ]
+    if not ephemeral_dbs:
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(ephemeral_dbs), MAX_ADMIN_WORKERS)
+    ) as executor:
+        future_to_db = {
+            executor.submit(_drop_copy, ephemeral_db): ephemeral_db
+            for ephemeral_db in ephemeral_dbs
+        }
+        for fut in as_completed(future_to_db):
             try:
-                subprocess.run(
-                    drop_cmd,
-                    check=True,
-                    env=env_vars,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to drop ephemeral db {ephemeral_db}: {e}")
+                fut.result()
+            except Exception as e:
+                # Keep going, so one stuck database does not prevent the others
+                # from being cleaned up.
+                logger.error("Failed to drop ephemeral db %s: %s", future_to_db[fut], e)
+
+
+# Statements that must not be combined into a committed batch: transaction
+# control would interfere with the per-statement COMMITs
+_TRANSACTION_CONTROL_RE = re.compile(
+    r"\s*(?:begin|start\s+transaction|commit|end|rollback|abort|savepoint|release"
+    r"|prepare\s+transaction)\b",
+    re.IGNORECASE,
+)
+
+# Statements that read the clock: every statement of a batch arrives in one
+# message and so shares its statement_timestamp, which now() and the SQL-standard
+# CURRENT_* values derive from. Sent one by one they would each see their own.
+_CLOCK_RE = re.compile(
+    r"\b(?:now|current_timestamp|current_date|current_time|localtime|localtimestamp"
+    r"|statement_timestamp|transaction_timestamp|clock_timestamp|timeofday"
+    r"|pg_sleep\w*|age)\b|'(?:now|today|tomorrow|yesterday)'",
+    re.IGNORECASE,
+)
+
+# Progress marker of a committed batch; committed together with each statement,
+# so after a failure it names the last statement that went through
+_BATCH_STEP_SQL = "SELECT set_config('livesqlbench.batch_step', '{}', false)"
+_BATCH_STEP_READ_SQL = "SELECT current_setting('livesqlbench.batch_step', true)"
+
+
+def _can_batch(queries):
+    """
+    True when every query is a single statement without transaction control
+    that does not read the clock, so the queries can be sent as one committed
+    batch.
+    """
+    for query in queries:
+        if (
+            ";" in query.strip().rstrip(";")
+            or _TRANSACTION_CONTROL_RE.match(query)
+            or _CLOCK_RE.search(query)
+        ):
+            return False
+    return True
+
 
+def _run_committed_batch(cursor, queries):
+    """
+    Send queries in one round trip, each followed by a progress marker and a
+    COMMIT, in autocommit mode. Every statement is committed on its own, as when
+    sent one by one: a failure leaves the earlier statements committed and skips
+    the later ones, and nothing is ever executed twice. Unlike statements sent
+    one by one they all share one statement_timestamp, hence one now(); callers
+    keep clock-reading SQL out of batches (see _can_batch).
 
-def execute_queries(queries, db_name, conn, logger=None, section_title=""):
+    Returns:
+        (rows, None) with the rows of the last query, or
+        (None, (failed_index, error)) with the 0-based index of the failing query
+    """
+    MAX_ROWS = 10000
+    conn = cursor.connection
+
+    parts = [_BATCH_STEP_SQL.format(0), "COMMIT"]
+    for i, query in enumerate(queries, start=1):
+        parts.append(query.rstrip().rstrip(";"))
+        if i < len(queries):
+            parts.extend([_BATCH_STEP_SQL.format(i), "COMMIT"])
+    # The separator starts on a new line so a trailing "-- comment" cannot
+    # swallow it
+    combined = "\n;\n".join(parts)
+
+    was_autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        try:
+            cursor.execute(combined)
+        except Exception as e:
+            try:
+                cursor.execute(_BATCH_STEP_READ_SQL)
+                done = int(cursor.fetchone()[0] or 0)
+            except Exception:
+                done = 0  # e.g. the connection is gone; nothing to tell
+            return None, (done, e)
+
+        try:
+            rows = cursor.fetchmany(MAX_ROWS + 1)
+            if len(rows) > MAX_ROWS:
+                rows = rows[:MAX_ROWS]
+        except psycopg2.ProgrammingError:
+            rows = None
+        return rows, None
+    finally:
+        if not was_autocommit and not conn.closed:
+            conn.autocommit = False
+
+
+def _log_query_error(logger, query_number, e):
+    """
+    Log a failed query and return its (execution_error, timeout_error) flags.
+    """
+    if isinstance(e, psycopg2.errors.QueryCanceled):
+        # Timeout error
+        logger.error("Timeout error executing query %s: %s", query_number, e)
+        return False, True
+    if isinstance(e, OperationalError):
+        # Operational errors (e.g., server not available, etc.)
+        logger.error("OperationalError executing query %s: %s", query_number, e)
+    elif isinstance(e, psycopg2.Error):
+        # Other psycopg2 errors (e.g., syntax errors, constraint violations)
+        logger.error("psycopg2 Error executing query %s: %s", query_number, e)
+    else:
+        # Any other generic error
+        logger.error("Generic error executing query %s: %s", query_number, e)
+    return True, False
+
+
+def execute_queries(queries, db_name, conn, logger=None, section_title="", batch=False):
     """
     Execute a list of queries using the SAME connection (conn).
     Returns (query_result, execution_error_flag, timeout_flag).
     Once the first error occurs, we break out and return immediately.
 
+    With batch=True the queries are sent in a single round trip, each one still
+    committed on its own (see _run_committed_batch), so the database ends up the
+    same as when they are sent one by one. Batches that cannot keep that promise
+    (transaction control, several statements in one query, clock functions, an
+    open transaction) fall back to one query at a time.
+
     Returns:
         (query_result, execution_error, timeout_error):
             query_result: list of tuples, each tuple is a row of the result
@@ -376,44 +695,48 @@ def execute_queries(queries, db_name, conn, logger=None, section_title=""):
     if isinstance(queries, str):
         queries = [queries]
 
-    for i, query in enumerate(queries):
-        try:
-            logger.info(f"Executing query {i+1}/{len(queries)}: {query}")
-            query_result, conn = perform_query_on_postgresql_databases(
-                query, db_name, conn=conn
-            )
-            logger.info(f"Query result: {query_result}")
-
-        except psycopg2.errors.QueryCanceled as e:
-            # Timeout error
-            logger.error(f"Timeout error executing query {i+1}: {e}")
-            timeout_error = True
-            break
-
-        except OperationalError as e:
-            # Operational errors (e.g., server not available, etc.)
-            logger.error(f"OperationalError executing query {i+1}: {e}")
-            execution_error = True
-            break
-
-        except psycopg2.Error as e:
-            # Other psycopg2 errors (e.g., syntax errors, constraint violations)
-            logger.error(f"psycopg2 Error executing query {i+1}: {e}")
-            execution_error = True
-            break
-
-        except Exception as e:
-            # Any other generic error
-            logger.error(f"Generic error executing query {i+1}: {e}")
-            execution_error = True
-            break
-
-        finally:
-            logger.info(f"[{section_title}] DB: {db_name}, conn info: {conn}")
-
-        # If an error is flagged, don't continue subsequent queries
-        if execution_error or timeout_error:
-            break
+    if conn is None:
+        conn = _get_or_init_pool(db_name).getconn()
+
+    logger.info("[%s] DB: %s, conn info: %s", section_title, db_name, conn)
+
+    # One cursor serves every query of the phase
+    with conn.cursor() as cursor:
+        if (
+            batch
+            and len(queries) > 1
+            and conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+            and _can_batch(queries)
+        ):
+            logger.info("Executing %d queries as one batch", len(queries))
+            query_result, failure = _run_committed_batch(cursor, queries)
+            if failure is None:
+                # Lazy %-formatting: rows are only stringified if the record is emitted
+                logger.info("Query result: %s", query_result)
+            else:
+                failed_index, e = failure
+                logger.info(
+                    "Queries 1-%d committed, query %d failed: %s",
+                    failed_index,
+                    failed_index + 1,
+                    queries[failed_index] if failed_index < len(queries) else "",
+                )
+                execution_error, timeout_error = _log_query_error(
+                    logger, failed_index + 1, e
+                )
+            logger.info("[%s] DB: %s, conn info: %s", section_title, db_name, conn)
+            log_section_footer(logger)
+            return query_result, execution_error, timeout_error
 
+        for i, query in enumerate(queries):
+            try:
+                logger.info("Executing query %d/%d: %s", i + 1, len(queries), query)
+                query_result = perform_query_on_cursor(cursor, query)
+                logger.info("Query result: %s", query_result)
+            except Exception as e:
+                execution_error, timeout_error = _log_query_error(logger, i + 1, e)
+                break
+
+    logger.info("[%s] DB: %s, conn info: %s", section_title, db_name, conn)
     log_section_footer(logger)
     return query_result, execution_error, timeout_error
@@ -3,30 +3,38 @@ import argparse
 import sys
 import os
 import io
+import itertools
 import multiprocessing
+import signal
 import threading
+import time
 import queue
-import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from tqdm import tqdm as tqdm_progress
 
 # Local imports
 from logger import (
     configure_logger,
+    start_log_listener,
+    stop_log_listener,
     NullLogger,
 )
 from db_config import set_global_db_config
-from utils import load_jsonl, split_field, save_report_and_status
+from utils import load_jsonl, split_field, save_report_and_status, json_dumps_line
 from db_utils import (
     perform_query_on_postgresql_databases,
-    close_postgresql_connection,
     execute_queries,
     close_all_postgresql_pools,
+    close_postgresql_pool,
     get_connection_for_phase,
+    phase_connection,
+    reset_session,
     reset_and_restore_database,
     create_ephemeral_db_copies,
     drop_ephemeral_dbs,
+    queries_are_read_only,
 )
 from test_utils import (
     check_sql_function_usage,
@@ -60,24 +68,107 @@ def _get_pg_password() -> str:
     )
 
 
+# In a test case worker: the manager dict shared with the parent, see
+# _run_in_test_case_pool
+_worker_progress = None
+
+
+def _init_test_case_worker(db_host, db_port, progress):
+    """
+    Initializer of the test case worker processes: apply the parent's db settings
+    and keep the progress dict.
+    """
+    global _worker_progress
+    _worker_progress = progress
+    set_global_db_config(host=db_host, port=db_port)
+
+
+# Per test case time limit, enforced inside the process running the test case
+TEST_CASE_TIMEOUT = 60
+
+
+class _TestCaseTimeout(BaseException):
+    """
+    Raised in a test case that ran past TEST_CASE_TIMEOUT. Derives from
+    BaseException so `except Exception` blocks in test code cannot swallow it.
+    """
+
+
+def _raise_test_case_timeout(signum, frame):
+    raise _TestCaseTimeout()
+
+
+# Helpers visible to test case code as globals
+_TC_GLOBAL_ENV = {
+    "perform_query_on_postgresql_databases": perform_query_on_postgresql_databases,
+    "execute_queries": execute_queries,
+    "ex_base": ex_base,
+    "performance_compare_by_qep": performance_compare_by_qep,
+    "check_sql_function_usage": check_sql_function_usage,
+    "remove_distinct": remove_distinct,
+    "remove_comments": remove_comments,
+    "remove_round": remove_round,
+    "preprocess_results": preprocess_results,
+}
+
+
+class _NullWriter(io.TextIOBase):
+    """
+    sys.stdout stand-in that discards test case output nobody will read.
+    """
+
+    def write(self, s):
+        return len(s)
+
+
+_NULL_STDOUT = _NullWriter()
+
+
+def _cancel_after_deadline(conn, timeout, finished, timed_out):
+    """
+    Cancel the queries running on conn once timeout seconds pass without
+    finished being set, and keep cancelling until it is, so the remaining
+    statements of a timed out test case cannot run unbounded either.
+    """
+    if finished.wait(timeout):
+        return
+    timed_out.set()
+    while True:
+        try:
+            conn.cancel()
+        except Exception:
+            pass
+        if finished.wait(0.5):
+            return
+
+
+@lru_cache(maxsize=4096)
+def _compile_test_case(test_code):
+    """
+    Compile a test case source once; the same test_code is reused across instances
+    and worker processes keep the cache for their whole lifetime.
+    """
+    test_case_code = "from datetime import date\n" + test_code
+    test_case_code += (
+        "\n__test_case_result__ = test_case(pred_sqls, sol_sqls, db_name, conn, **kwargs)"
+    )
+    return compile(test_case_code, "<test_case>", "exec")
+
+
 def run_test_case(
-    test_code, result, logger, idx, return_dict, conn, pred_sqls, sol_sqls, db_name, kwargs
+    test_code, result, idx, pred_sqls, sol_sqls, db_name, kwargs, conn, capture_output=True
 ):
     """
-    In a separate Process, runs the test_code with the given environment and captures pass/fail status.
-    """
-    global_env = {
-        "perform_query_on_postgresql_databases": perform_query_on_postgresql_databases,
-        "execute_queries": execute_queries,
-        "ex_base": ex_base,
-        "performance_compare_by_qep": performance_compare_by_qep,
-        "check_sql_function_usage": check_sql_function_usage,
-        "remove_distinct": remove_distinct,
-        "remove_comments": remove_comments,
-        "remove_round": remove_round,
-        "preprocess_results": preprocess_results,
-        "pred_query_result": result,
-    }
+    Runs the test_code with the given environment and captures pass/fail status.
+    The test case's printed output is returned when capture_output, else dropped.
+
+    Returns:
+        (idx, status, error_message, captured_output)
+    """
+    # A shallow copy per call: exec adds __builtins__ to the globals it is given,
+    # and test_case resolves pred_query_result as a global, not from local_env.
+    global_env = dict(_TC_GLOBAL_ENV, pred_query_result=result)
+
     local_env = {
         "conn": conn,
         "pred_sqls": pred_sqls,
@@ -86,97 +177,246 @@ def run_test_case(
         "kwargs": kwargs,
     }
 
-    logger.info(f"Passing result is {result}")
-
-    test_case_code = "from datetime import date\n" + test_code
-    test_case_code += (
-        "\n__test_case_result__ = test_case(pred_sqls, sol_sqls, db_name, conn, **kwargs)"
-    )
-
-    logger.info(f"Test case content:\n{test_case_code}")
-    logger.info(f"Executing test case {idx}")
-
     old_stdout = sys.stdout
-    mystdout = io.StringIO()
+    mystdout = io.StringIO() if capture_output else _NULL_STDOUT
     sys.stdout = mystdout
 
+    # SIGALRM can only be handled on the main thread, which is where the worker
+    # processes run their tasks
+    use_alarm = (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_test_case_timeout)
+        signal.setitimer(signal.ITIMER_REAL, TEST_CASE_TIMEOUT)
+        # The alarm only interrupts Python code; cancelling the running query makes
+        # a blocked psycopg2 call return so the alarm can be handled
+        finished = threading.Event()
+        watcher = threading.Thread(
+            target=_cancel_after_deadline,
+            args=(conn, TEST_CASE_TIMEOUT, finished, threading.Event()),
+            daemon=True,
+        )
+        watcher.start()
+
+    error_message = None
     try:
         if DEBUG_TEST_CASE_DEFAULT:
             from datetime import date
             __test_case_result__ = test_case_default(pred_sqls, sol_sqls, db_name, conn, **kwargs)
         else:
-            exec(test_case_code, global_env, local_env)
-        logger.info(f"Test case {idx} passed.")
-        return_dict[idx] = "passed"
+            exec(_compile_test_case(test_code), global_env, local_env)
+        status = "passed"
+    except _TestCaseTimeout:
+        error_message = f"Test case {idx} execution timed out."
+        status = "timeout"
     except AssertionError as e:
-        logger.error(f"Test case {idx} failed due to assertion error: {e}")
-        return_dict[idx] = "failed"
+        error_message = f"Test case {idx} failed due to assertion error: {e}"
+        status = "failed"
     except Exception as e:
-        logger.error(f"Test case {idx} failed due to error: {e}")
-        return_dict[idx] = "failed"
+        error_message = f"Test case {idx} failed due to error: {e}"
+        status = "failed"
     finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+            finished.set()
+            watcher.join()
         sys.stdout = old_stdout
 
-    captured_output = mystdout.getvalue()
-    if captured_output.strip():
-        logger.info(f"Captured output from test_code:\n{captured_output}")
+    captured_output = mystdout.getvalue() if capture_output else ""
+    return idx, status, error_message, captured_output
+
+
+def run_test_cases(
+    test_cases,
+    result,
+    pred_sqls,
+    sol_sqls,
+    db_name,
+    kwargs,
+    conn=None,
+    capture_output=True,
+    first_idx=1,
+    task_id=None,
+):
+    """
+    Runs test cases of an instance in order, numbered from first_idx, as one task
+    of _test_case_pool.
+    Without a conn it opens its own connection to db_name and closes it when done.
+    With a task_id it records (pid, outcomes so far) under it in _worker_progress
+    before each test case, so the parent can keep them if the worker is lost.
+
+    Returns:
+        list of run_test_case outcomes
+    """
+    outcomes = []
+    pid = os.getpid()
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection_for_phase(db_name, NullLogger())
+    try:
+        for idx, test_case in enumerate(test_cases, start=first_idx):
+            if task_id is not None:
+                _worker_progress[task_id] = (pid, outcomes)
+            outcomes.append(
+                run_test_case(
+                    test_case,
+                    result,
+                    idx,
+                    pred_sqls,
+                    sol_sqls,
+                    db_name,
+                    kwargs,
+                    conn,
+                    capture_output=capture_output,
+                )
+            )
+        return outcomes
+    finally:
+        if own_conn:
+            # The parent may drop and re-create the database right after these
+            # test cases, so do not keep a pooled connection to it in the worker.
+            close_postgresql_pool(db_name)
+
+
+# Worker processes for test cases, created in main() and reused across instances.
+# multiprocessing.Pool replaces a worker that dies without disturbing the tasks
+# of the other workers.
+_test_case_pool = None
+# Manager dict in which each pool task records its worker's pid and outcomes
+_test_case_progress = None
+_test_case_task_ids = itertools.count()
+
+
+class _TestCaseWorkerLost(Exception):
+    """
+    Raised when the worker running a task of test cases died (timed_out=False) or
+    was killed for running past its deadline (timed_out=True). outcomes holds the
+    test cases the task finished before that.
+    """
+
+    def __init__(self, outcomes, timed_out):
+        super().__init__(outcomes, timed_out)
+        self.outcomes = outcomes
+        self.timed_out = timed_out
+
+
+def _process_alive(pid):
+    """
+    True while the process pid exists (the pool reaps its dead workers).
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _run_in_test_case_pool(timeout, *args, **kwargs):
+    """
+    Run run_test_cases(*args, **kwargs) as one task of _test_case_pool.
+
+    The worker times out its test cases itself, so a test case still running
+    after timeout seconds is stuck where neither the alarm nor a query cancel
+    reaches: only that worker is killed (the pool starts a replacement).
+    _TestCaseWorkerLost is raised when the worker is killed or dies. Tasks of
+    other instances keep running either way, and nothing is run a second time.
+    """
+    task_id = next(_test_case_task_ids)
+    async_result = _test_case_pool.apply_async(
+        run_test_cases, args, dict(kwargs, task_id=task_id)
+    )
+    progress = None
+    try:
+        while not async_result.ready():
+            async_result.wait(0.5)
+            if async_result.ready():
+                break
+            current = _test_case_progress.get(task_id)
+            if current is None:
+                continue  # Still queued behind other instances
+            if progress is None or len(current[1]) != len(progress[1]):
+                # A new test case started
+                progress, started = current, time.monotonic()
+            pid, outcomes = progress
+            if not _process_alive(pid):
+                raise _TestCaseWorkerLost(outcomes, timed_out=False)
+            if time.monotonic() - started > timeout:
+                os.kill(pid, signal.SIGKILL)
+                raise _TestCaseWorkerLost(outcomes, timed_out=True)
+        return async_result.get()
+    finally:
+        _test_case_progress.pop(task_id, None)
 
 
 def execute_test_cases(
     test_cases, sql_result, logger, conn, pred_sqls, sol_sqls, db_name, kwargs
 ):
     """
-    Spawns each test case in a separate Process.
+    Runs the test cases of an instance as a single task of _test_case_pool.
     Returns (passed_count, failed_tests).
     """
-    manager = multiprocessing.Manager()
-    return_dict = manager.dict()
-    processes = []
-
+    logger.info("Passing result is %s", sql_result)
     for i, test_case in enumerate(test_cases, start=1):
-        logger.info(f"Starting test case {i}/{len(test_cases)}")
-        if MULTI_THREAD:
-            p = multiprocessing.Process(
-                target=run_test_case,
-                args=(
-                    test_case,
+        logger.info("Starting test case %s/%s", i, len(test_cases))
+        logger.info("Test case content:\n%s", test_case)
+        logger.info("Executing test case %s", i)
+
+    # Captured output only ends up in the log, so skip collecting it without one
+    capture_output = not isinstance(logger, NullLogger)
+    statuses = {}
+    if MULTI_THREAD:
+        outcomes = []
+        next_idx = 1
+        while next_idx <= len(test_cases):
+            try:
+                # The worker enforces TEST_CASE_TIMEOUT per test case itself; this
+                # only catches a worker stuck in C code that the alarm cannot reach.
+                outcomes += _run_in_test_case_pool(
+                    TEST_CASE_TIMEOUT + 30,
+                    test_cases[next_idx - 1 :],
                     sql_result,
-                    logger,
-                    i,
-                    return_dict,
-                    conn,
                     pred_sqls,
                     sol_sqls,
                     db_name,
                     kwargs,
-                ),
-            )
-            p.start()
-            p.join(timeout=60)
-            if p.is_alive():
-                logger.error(f"Test case {i} execution timed out.")
-                p.terminate()
-                p.join()
-                return_dict[i] = "timeout"
-            processes.append(p)
-        else:
-            run_test_case(
-                test_case,
-                sql_result,
-                logger,
-                i,
-                return_dict,
-                conn,
-                pred_sqls,
-                sol_sqls,
-                db_name,
-                kwargs,
-            )
+                    capture_output=capture_output,
+                    first_idx=next_idx,
+                )
+                break
+            except _TestCaseWorkerLost as e:
+                # Keep what finished, charge the loss to the test case that was
+                # running, and go on with the ones that never started
+                outcomes += e.outcomes
+                lost_idx = next_idx + len(e.outcomes)
+                if e.timed_out:
+                    logger.error("Test case %s execution timed out.", lost_idx)
+                    statuses[lost_idx] = "timeout"
+                else:
+                    logger.error("Test case %s crashed its worker process.", lost_idx)
+                next_idx = lost_idx + 1
+            except Exception as e:
+                logger.error("Test cases failed due to error: %s", e)
+                break
+    else:
+        outcomes = run_test_cases(
+            test_cases,
+            sql_result,
+            pred_sqls,
+            sol_sqls,
+            db_name,
+            kwargs,
+            conn=conn,
+            capture_output=capture_output,
+        )
+    _log_test_case_outcomes(outcomes, statuses, logger)
 
     passed_count = 0
     failed_tests = []
     for idx in range(1, len(test_cases) + 1):
-        status = return_dict.get(idx, "failed")
+        status = statuses.get(idx, "failed")
         if status == "passed":
             passed_count += 1
         else:
@@ -185,13 +425,71 @@ def execute_test_cases(
     return passed_count, failed_tests
 
 
+def _log_test_case_outcomes(outcomes, statuses, logger):
+    """
+    Record and log the (idx, status, error_message, captured_output) of test cases.
+    """
+    for idx, status, error_message, captured_output in outcomes:
+        statuses[idx] = status
+        if status == "passed":
+            logger.info("Test case %s passed.", idx)
+        else:
+            logger.error(error_message)
+        if captured_output.strip():
+            logger.info("Captured output from test_code:\n%s", captured_output)
+
+
+def run_default_test_case(logger, conn, pred_sqls, sol_sqls, db_name, kwargs):
+    """
+    Runs TEST_CASE_DEFAULT in-process through test_case_default, without a worker
+    process or exec. It only runs queries on conn, so TEST_CASE_TIMEOUT is
+    enforced by cancelling them from a watcher thread; statement_timeout alone
+    neither bounds the total time nor survives a SET in the predicted SQL.
+    Returns (passed_count, failed_tests).
+    """
+    logger.info("Executing default test case in-process")
+    finished = threading.Event()
+    timed_out = threading.Event()
+    watcher = threading.Thread(
+        target=_cancel_after_deadline,
+        args=(conn, TEST_CASE_TIMEOUT, finished, timed_out),
+        daemon=True,
+    )
+    watcher.start()
+    error_message = None
+    try:
+        test_case_default(pred_sqls, sol_sqls, db_name, conn, logger=logger, **kwargs)
+    except AssertionError as e:
+        error_message = f"Test case 1 failed due to assertion error: {e}"
+    except Exception as e:
+        error_message = f"Test case 1 failed due to error: {e}"
+    finally:
+        finished.set()
+        watcher.join()
+
+    # A cancelled query usually surfaces as a failed comparison, so check first
+    if timed_out.is_set():
+        logger.error("Test case 1 execution timed out.")
+        return 0, ["test_1"]
+    if error_message is not None:
+        logger.error(error_message)
+        return 0, ["test_1"]
+    logger.info("Test case 1 passed.")
+    return 1, []
+
+
 def run_preprocessing(preprocess_sql, db_name, logger, conn):
     """
     Execute any pre-processing SQL statements.
     """
     if preprocess_sql:
         execute_queries(
-            preprocess_sql, db_name, conn, logger, section_title="Preprocess SQL"
+            preprocess_sql,
+            db_name,
+            conn,
+            logger,
+            section_title="Preprocess SQL",
+            batch=True,
         )
 
 
@@ -203,6 +501,9 @@ def run_evaluation_phase(
     2. If no error, run test cases.
     Returns tuple of flags + (passed_count, failed_tests).
     """
+    # Sent one by one, never batched: this is the SQL being scored, and a batch
+    # shares one now() across its statements, which column defaults and triggers
+    # can pick up without the SQL text mentioning the clock.
     sol_sql_result, exec_error_flag, timeout_flag = execute_queries(
         pred_sqls, db_name, conn, logger, section_title="LLM Generated SQL"
     )
@@ -214,16 +515,21 @@ def run_evaluation_phase(
     failed_tests = []
 
     if not instance_execution_error and not instance_timeout_error and test_cases:
-        passed_count, failed_tests = execute_test_cases(
-            test_cases,
-            sol_sql_result,
-            logger,
-            conn,
-            pred_sqls,  # pred_sqls param for run_test_case
-            sol_sqls,  # sol_sqls param for run_test_case
-            db_name,
-            kwargs,
-        )
+        if len(test_cases) == 1 and test_cases[0] is TEST_CASE_DEFAULT:
+            passed_count, failed_tests = run_default_test_case(
+                logger, conn, pred_sqls, sol_sqls, db_name, kwargs
+            )
+        else:
+            passed_count, failed_tests = execute_test_cases(
+                test_cases,
+                sol_sql_result,
+                logger,
+                conn,
+                pred_sqls,  # pred_sqls param for run_test_case
+                sol_sqls,  # sol_sqls param for run_test_case
+                db_name,
+                kwargs,
+            )
 
         if failed_tests:
             instance_assertion_error = True
@@ -237,18 +543,14 @@ def run_evaluation_phase(
     )
 
 
-def process_one_instance(data_item, ephemeral_db_queues, args, global_stats_lock):
+def process_one_instance(data_item, ephemeral_db_queues, args):
     """
     Orchestrate the entire logic for a single instance:
       - Acquire ephemeral DB
       - Evaluation Phase
       - Cleanup
-      - Update global counters
+    The returned error flags are aggregated by main().
     """
-    global number_of_execution_errors, number_of_timeouts
-    global number_of_assertion_errors
-    global total_passed_instances, number_error_unexpected_pass
-
     instance_id = data_item["instance_id"]
     base_name = os.path.splitext(os.path.basename(args.jsonl_file))[0]
     output_dir = args.output_dir if getattr(args, "output_dir", None) else os.path.dirname(args.jsonl_file)
@@ -269,9 +571,7 @@ def process_one_instance(data_item, ephemeral_db_queues, args, global_stats_lock
     ]
     missing_fields = [field for field in required_fields if field not in data_item]
     if missing_fields:
-        logger.error(f"Missing required fields: {', '.join(missing_fields)}")
-        with global_stats_lock:
-            number_of_execution_errors += 1
+        logger.error("Missing required fields: %s", ', '.join(missing_fields))
         return {
             "instance_id": instance_id,
             "status": "failed",
@@ -279,7 +579,8 @@ def process_one_instance(data_item, ephemeral_db_queues, args, global_stats_lock
             "total_test_cases": len(data_item.get("test_cases", [])),
             "passed_test_cases": 0,
             "failed_test_cases": [],
-            "evaluation_phase_execution_error": False,
+            # Counted as an execution error
+            "evaluation_phase_execution_error": True,
             "evaluation_phase_timeout_error": False,
             "evaluation_phase_assertion_error": False,
         }
@@ -305,7 +606,9 @@ def process_one_instance(data_item, ephemeral_db_queues, args, global_stats_lock
     else:
         # Management queries should have test cases
         if not test_cases:
-            logger.warning(f"No test cases for instance {instance_id} with category {category}")
+            logger.warning(
+                "No test cases for instance %s with category %s", instance_id, category
+            )
 
     evaluation_phase_execution_error = False
     evaluation_phase_timeout_error = False
@@ -319,10 +622,7 @@ def process_one_instance(data_item, ephemeral_db_queues, args, global_stats_lock
     try:
         ephemeral_db = ephemeral_db_queues[db_name].get(timeout=60)
     except queue.Empty:
-        logger.error(f"No available ephemeral databases for base_db: {db_name}")
-        with global_stats_lock:
-            print("run here")
-            number_of_execution_errors += 1
+        logger.error("No available ephemeral databases for base_db: %s", db_name)
         return {
             "instance_id": instance_id,
             "status": "failed",
@@ -335,81 +635,75 @@ def process_one_instance(data_item, ephemeral_db_queues, args, global_stats_lock
             "evaluation_phase_assertion_error": False,
         }
 
-    logger.info(f"Instance {instance_id} is using ephemeral db: {ephemeral_db}")
+    logger.info("Instance %s is using ephemeral db: %s", instance_id, ephemeral_db)
 
     try:
 
         # ---------- Evaluation Phase ----------
         logger.info("=== Starting Evaluation Phase ===")
 
-        evaluation_conn = get_connection_for_phase(ephemeral_db, logger)
-        run_preprocessing(preprocess_sql, ephemeral_db, logger, evaluation_conn)
+        with phase_connection(ephemeral_db, logger) as evaluation_conn:
+            run_preprocessing(preprocess_sql, ephemeral_db, logger, evaluation_conn)
 
-        (
-            evaluation_phase_execution_error,
-            evaluation_phase_timeout_error,
-            evaluation_phase_assertion_error,
-            passed_count,
-            failed_tests,
-        ) = run_evaluation_phase(
-            pred_sqls,
-            sol_sqls,
-            ephemeral_db,
-            test_cases,
-            logger,
-            evaluation_conn,
-            efficiency,
-            kwargs,
-        )
-
-        close_postgresql_connection(ephemeral_db, evaluation_conn)
-
-        passed_test_cases_count += passed_count
-        failed_test_cases.extend(failed_tests)
-
-        # Cleanup SQL
-        if clean_up_sql:
-            logger.info("Executing Clean Up SQL after solution phase.")
-            new_temp_conn = get_connection_for_phase(ephemeral_db, logger)
-            execute_queries(
-                clean_up_sql,
+            (
+                evaluation_phase_execution_error,
+                evaluation_phase_timeout_error,
+                evaluation_phase_assertion_error,
+                passed_count,
+                failed_tests,
+            ) = run_evaluation_phase(
+                pred_sqls,
+                sol_sqls,
                 ephemeral_db,
-                new_temp_conn,
+                test_cases,
                 logger,
-                section_title="Clean Up SQL",
+                evaluation_conn,
+                efficiency,
+                kwargs,
             )
-            close_postgresql_connection(ephemeral_db, new_temp_conn)
 
-        reset_and_restore_database(ephemeral_db, "123123", logger)
+            passed_test_cases_count += passed_count
+            failed_test_cases.extend(failed_tests)
+
+            # Cleanup SQL, on the same connection once its session is reset
+            if clean_up_sql:
+                logger.info("Executing Clean Up SQL after solution phase.")
+                reset_session(evaluation_conn)
+                execute_queries(
+                    clean_up_sql,
+                    ephemeral_db,
+                    evaluation_conn,
+                    logger,
+                    section_title="Clean Up SQL",
+                    batch=True,
+                )
+
+        # Query instances only run the default test case, which re-runs the same
+        # SQL, so read-only SQL leaves the ephemeral db as the template made it.
+        if (
+            args.fast_reset == "true"
+            and category == "Query"
+            and queries_are_read_only(
+                preprocess_sql + pred_sqls + sol_sqls + clean_up_sql
+            )
+        ):
+            logger.info("Only read-only SQL ran, skipping reset of %s", ephemeral_db)
+        else:
+            reset_and_restore_database(ephemeral_db, "123123", logger)
         logger.info("=== Evaluation Phase Completed ===")
 
     except Exception as e:
         print(f"RUN HERE instance {instance_id} with ERROR {e}")
-        logger.error(f"Error during execution for question {instance_id}: {e}")
+        logger.error("Error during execution for question %s: %s", instance_id, e)
         error_message_text += str(e)
 
     finally:
         # Return the ephemeral database to the queue
         ephemeral_db_queues[db_name].put(ephemeral_db)
         logger.info(
-            f"Instance {instance_id} finished. Returned ephemeral db: {ephemeral_db}"
+            "Instance %s finished. Returned ephemeral db: %s", instance_id, ephemeral_db
         )
 
-    # ---------- Update Global Stats ----------
-    with global_stats_lock:
-        if evaluation_phase_execution_error:
-            number_of_execution_errors += 1
-        if evaluation_phase_timeout_error:
-            number_of_timeouts += 1
-        if evaluation_phase_assertion_error:
-            number_of_assertion_errors += 1
-        if (
-            not evaluation_phase_execution_error
-            and not evaluation_phase_timeout_error
-            and not evaluation_phase_assertion_error
-        ):
-            total_passed_instances += 1
-
     # ---------- Determine status ----------
     ret_status = "success"
     if (
@@ -437,6 +731,7 @@ def main():
     global number_of_assertion_errors
     global total_passed_instances, number_error_unexpected_pass
     global question_test_case_results
+    global _test_case_pool, _test_case_progress
 
     parser = argparse.ArgumentParser(
         description="Execute SQL solution and test cases (PostgreSQL)."
@@ -461,6 +756,17 @@ def main():
         default="false",
         help="Enable or disable per-instance logging ('true' or 'false').",
     )
+    parser.add_argument(
+        "--fast_reset",
+        type=str,
+        default="false",
+        help=(
+            "Skip the database reset after Query instances whose SQL looks "
+            "read-only ('true' or 'false'). The check only reads the SQL text and "
+            "misses user-defined functions with side effects, so only enable it "
+            "for datasets known not to use them."
+        ),
+    )
     parser.add_argument(
         "--db_host",
         type=str,
@@ -481,8 +787,28 @@ def main():
     )
     args = parser.parse_args()
 
+    # Log files are written by one background thread instead of every worker
+    start_log_listener()
+
     set_global_db_config(host=args.db_host, port=args.db_port)
 
+    if MULTI_THREAD:
+        # Test cases run in separate processes so a misbehaving test case cannot
+        # take the evaluator down; the workers are started once and reused.
+        mp_context = multiprocessing.get_context("forkserver")
+        # Import the heavy modules once in the fork server, so every worker forked
+        # from it starts warm instead of re-importing them
+        mp_context.set_forkserver_preload(
+            ["psycopg2", "db_utils", "test_utils", "logger"]
+        )
+        test_case_manager = mp_context.Manager()
+        _test_case_progress = test_case_manager.dict()
+        _test_case_pool = mp_context.Pool(
+            processes=args.num_threads,
+            initializer=_init_test_case_worker,
+            initargs=(args.db_host, args.db_port, _test_case_progress),
+        )
+
     data_list = load_jsonl(args.jsonl_file)
 
     # or to load the data from the Hugging Face dataset
@@ -496,6 +822,9 @@ def main():
     if args.limit is not None:
         data_list = data_list[: args.limit]
 
+    # Sort once up front; the report and output follow this order
+    data_list.sort(key=lambda x: x["instance_id"])
+
     # Collect base DB names
     all_db_names = set()
     for d in data_list:
@@ -511,7 +840,7 @@ def main():
     ephemeral_db_log_filename = os.path.join(experiment_dir, "multi_thread.log")
     ephemeral_db_logger = configure_logger(ephemeral_db_log_filename)
     ephemeral_db_logger.info(
-        f"=== Starting Multi-Thread Evaluation with {args.num_threads} threads ==="
+        "=== Starting Multi-Thread Evaluation with %s threads ===", args.num_threads
     )
 
     # Create ephemeral DB copies
@@ -530,13 +859,17 @@ def main():
             q.put(ep_db)
         ephemeral_db_queues[base_db] = q
 
-    global_stats_lock = threading.Lock()
-    results = []
+    results_by_id = {}
     total_instances = len(data_list)
 
     if MULTI_THREAD:
         with ThreadPoolExecutor(max_workers=args.num_threads) as executor, tqdm_progress(
-            total=total_instances, desc="Evaluating Questions"
+            total=total_instances,
+            desc="Evaluating Questions",
+            # Redraw at most twice a second, and not at all when stderr is redirected
+            mininterval=0.5,
+            miniters=max(1, total_instances // 200),
+            disable=not sys.stderr.isatty(),
         ) as pbar:
             future_to_data = {}
             for data_item in data_list:
@@ -545,13 +878,12 @@ def main():
                     data_item,
                     ephemeral_db_queues,
                     args,
-                    global_stats_lock,
                 )
                 future_to_data[future] = data_item
 
             for fut in as_completed(future_to_data):
                 res = fut.result()
-                results.append(res)
+                results_by_id[res["instance_id"]] = res
                 pbar.update(1)
     else:
         for data_item in data_list:
@@ -561,12 +893,31 @@ def main():
                     import pdb; pdb.set_trace()
                 else:
                     continue
-            res = process_one_instance(
-                data_item, ephemeral_db_queues, args, global_stats_lock
-            )
-            results.append(res)
-
-    question_test_case_results = results[:]
+            res = process_one_instance(data_item, ephemeral_db_queues, args)
+            results_by_id[res["instance_id"]] = res
+
+    if _test_case_pool is not None:
+        # Every task has been waited for; terminate rather than close and join,
+        # since tasks lost with a dead worker would keep join waiting forever
+        _test_case_pool.terminate()
+        _test_case_pool.join()
+        _test_case_pool = None
+        test_case_manager.shutdown()
+
+    # A KeyError here means an instance produced no result
+    question_test_case_results = [results_by_id[d["instance_id"]] for d in data_list]
+    number_of_execution_errors = sum(
+        1 for r in question_test_case_results if r["evaluation_phase_execution_error"]
+    )
+    number_of_timeouts = sum(
+        1 for r in question_test_case_results if r["evaluation_phase_timeout_error"]
+    )
+    number_of_assertion_errors = sum(
+        1 for r in question_test_case_results if r["evaluation_phase_assertion_error"]
+    )
+    total_passed_instances = sum(
+        1 for r in question_test_case_results if r["status"] == "success"
+    )
     # Summarize results
     total_errors = (
         number_of_execution_errors + number_of_timeouts + number_of_assertion_errors
@@ -579,13 +930,6 @@ def main():
     timestamp = datetime.now().isoformat(sep=" ", timespec="microseconds")
     report_file_path = os.path.join(experiment_dir, "report.txt")
 
-    # Sort data_list and results by instance_id to make sure they are in the same order
-    data_list = sorted(data_list, key=lambda x: x["instance_id"])
-    question_test_case_results = sorted(question_test_case_results, key=lambda x: x["instance_id"])
-    # check if the order is the same
-    for i in range(len(data_list)):
-        assert data_list[i]["instance_id"] == question_test_case_results[i]["instance_id"], f"The order of data_list and question_test_case_results is not the same at index {i}; data_list: {data_list[i]['instance_id']}, question_test_case_results: {question_test_case_results[i]['instance_id']}"
-
     # Generate the report + update data_list
     save_report_and_status(
         report_file_path,
@@ -604,11 +948,11 @@ def main():
     # If logging enabled, output JSONL with status
     if args.logging == "true":
         output_jsonl_file = os.path.join(experiment_dir, "output_with_status.jsonl")
-        with open(output_jsonl_file, "w") as f:
+        with open(output_jsonl_file, "wb", buffering=1 << 20) as f:
             for i, data in enumerate(data_list):
                 data["status"] = question_test_case_results[i]["status"]
                 data["error_message"] = question_test_case_results[i]["error_message"]
-                f.write(json.dumps(data) + "\n")
+                f.write(json_dumps_line(data))
 
     # Close all pools, drop ephemeral DBs
     try:
@@ -618,6 +962,7 @@ def main():
 
     drop_ephemeral_dbs(ephemeral_db_pool_dict, _get_pg_password(), ephemeral_db_logger)
     ephemeral_db_logger.info("All ephemeral databases have been dropped.")
+    stop_log_listener()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,71 @@
 import logging
+import logging.handlers
+import queue
+from collections import OrderedDict
+
+_LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+# Per-instance log files the background listener keeps open at the same time
+MAX_OPEN_LOG_FILES = 64
+
+
+class _PerFileHandler(logging.Handler):
+    """
+    Writes each record to the file its logger is named after (see configure_logger),
+    keeping only the most recently used files open.
+    """
+
+    def __init__(self, max_open_files=MAX_OPEN_LOG_FILES):
+        super().__init__()
+        self._max_open_files = max_open_files
+        self._file_handlers = OrderedDict()
+
+    def emit(self, record):
+        file_handler = self._file_handlers.get(record.name)
+        if file_handler is None:
+            file_handler = logging.FileHandler(record.name)
+            file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+            self._file_handlers[record.name] = file_handler
+            if len(self._file_handlers) > self._max_open_files:
+                _, oldest = self._file_handlers.popitem(last=False)
+                oldest.close()
+        else:
+            self._file_handlers.move_to_end(record.name)
+        file_handler.handle(record)
+
+    def close(self):
+        for file_handler in self._file_handlers.values():
+            file_handler.close()
+        self._file_handlers.clear()
+        super().close()
+
+
+# All loggers from configure_logger share one queue; a single background thread
+# does the file I/O while the listener is running.
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_listener = None
+
+
+def start_log_listener():
+    """
+    Start the background thread that writes the output of configure_logger loggers.
+    """
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = logging.handlers.QueueListener(_log_queue, _PerFileHandler())
+        _log_listener.start()
+
+
+def stop_log_listener():
+    """
+    Write out the pending records and close all log files.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
 
 
 def configure_logger(log_filename):
@@ -9,9 +76,14 @@ def configure_logger(log_filename):
     if logger.handlers:
         logger.handlers.clear()
 
+    if _log_listener is not None:
+        # The listener routes records to log_filename by logger name
+        logger.addHandler(_queue_handler)
+        return logger
+
     file_handler = logging.FileHandler(log_filename)
     file_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    formatter = logging.Formatter(_LOG_FORMAT)
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
     return logger
@@ -46,14 +118,19 @@ class NullLogger:
 class PrintLogger:
     """A Logger implementation that prints messages to stdout."""
 
+    @staticmethod
+    def _format(msg, args):
+        # Same lazy %-formatting as logging.Logger
+        return msg % args if args else msg
+
     def info(self, msg, *args, **kwargs):
-        print(f"[INFO] {msg}", *args, **kwargs)
+        print(f"[INFO] {self._format(msg, args)}")
 
     def error(self, msg, *args, **kwargs):
-        print(f"[ERROR] {msg}", *args, **kwargs)
+        print(f"[ERROR] {self._format(msg, args)}")
 
     def warning(self, msg, *args, **kwargs):
-        print(f"[WARNING] {msg}", *args, **kwargs)
+        print(f"[WARNING] {self._format(msg, args)}")
 
     def debug(self, msg, *args, **kwargs):
-        print(f"[DEBUG] {msg}", *args, **kwargs)
+        print(f"[DEBUG] {self._format(msg, args)}")
@@ -4,9 +4,38 @@ import re
 from datetime import date, datetime
 from decimal import ROUND_HALF_UP, Decimal
 
+import numpy as np
 import psycopg2
+
+try:
+    import orjson
+except ImportError:  # optional, several times faster than the stdlib json
+    orjson = None
+
 from db_utils import execute_queries, perform_query_on_postgresql_databases
 
+# SQL cleaning patterns, compiled once instead of on every call
+_ROUND_OPEN = re.compile(r"ROUND\s*\(", re.IGNORECASE)
+_PAREN_OR_COMMA = re.compile(r"[(),]")
+_ROUND_REGEX = re.compile(
+    r"ROUND\s*\(([^,()]*(?:\([^()]*\)[^,()]*)*?)(?:,[^)]*)?\)", re.IGNORECASE
+)
+_DISTINCT_RE = re.compile(r"\bDISTINCT\b", re.IGNORECASE)
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r"--.*?(\r\n|\r|\n)")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+# Block or line comment in one scan; the lookahead keeps the line's newline
+_COMMENTS_RE = re.compile(r"/\*.*?\*/|--[^\r\n]*(?=\r\n|\r|\n)", re.DOTALL)
+
+# Batched EXPLAIN in performance_compare_by_qep: dollar-quote tags and the
+# NOTICE each plan's cost is reported with
+_PLAN_COST_DO_TAG = "$lsb_do$"
+_PLAN_COST_SQL_TAG = "$lsb_sql$"
+_PLAN_COST_NOTICE_RE = re.compile(r"lsb_plan_cost (\d+) (\S+)")
+
+# Cell types that process_decimals rounds
+_ROUNDED_TYPES = (Decimal, float)
+
 
 def process_decimals(results, decimal_places):
     """
@@ -15,10 +44,16 @@ def process_decimals(results, decimal_places):
     quantizer = Decimal(1).scaleb(-decimal_places)
     rounded = []
     for row in results:
+        # Rows with nothing to round are kept as they are, without a copy
+        if type(row) is tuple and not any(
+            isinstance(item, _ROUNDED_TYPES) for item in row
+        ):
+            rounded.append(row)
+            continue
         new_row = []
         for item in row:
             if isinstance(item, Decimal):
-                new_row.append(item.quantize(quantizer, rounding=ROUND_HALF_UP))
+                new_row.append(item.quantize(quantizer, ROUND_HALF_UP))
             elif isinstance(item, float):
                 new_row.append(round(item, decimal_places))
             else:
@@ -27,74 +62,75 @@ def process_decimals(results, decimal_places):
     return rounded
 
 
-def remove_round_functions(sql_string):
+def _strip_round_calls(text):
     """
-    Remove all ROUND() function calls from a SQL string, including nested ones.
-    This regex properly handles nested functions with commas.
+    Replace every well-formed ROUND(arg, ...) in one left-to-right pass with its
+    stripped first argument, recursing into that argument for nested ROUNDs.
     """
-
-    def find_matching_paren(text, start_pos):
-        """Find the position of the matching closing parenthesis."""
-        paren_count = 0
-        for i in range(start_pos, len(text)):
-            if text[i] == "(":
-                paren_count += 1
-            elif text[i] == ")":
-                paren_count -= 1
-                if paren_count == 0:
-                    return i
-        return -1
-
-    def find_first_arg_end(text, start_pos):
-        """Find the end of the first argument, accounting for nested parentheses."""
-        paren_count = 0
-        for i in range(start_pos, len(text)):
-            if text[i] == "(":
-                paren_count += 1
-            elif text[i] == ")":
-                if paren_count == 0:
-                    return i  # End of ROUND function
-                paren_count -= 1
-            elif text[i] == "," and paren_count == 0:
-                return i  # End of first argument
-        return len(text)
-
-    result = sql_string
+    parts = []
+    pos = 0
 
     while True:
-        # Find ROUND function (case insensitive)
-        pattern = re.compile(r"ROUND\s*\(", re.IGNORECASE)
-        match = pattern.search(result)
-
+        match = _ROUND_OPEN.search(text, pos)
         if not match:
             break
 
-        start_pos = match.start()
         open_paren_pos = match.end() - 1
 
-        # Find the end of the first argument
-        first_arg_end = find_first_arg_end(result, open_paren_pos + 1)
-
-        # Find the matching closing parenthesis
-        close_paren_pos = find_matching_paren(result, open_paren_pos)
+        # Track depth once to find both the first-arg end and the matching paren,
+        # letting the regex engine skip over everything that isn't ( ) or ,
+        depth = 0
+        first_arg_end = -1
+        close_paren_pos = -1
+        for token in _PAREN_OR_COMMA.finditer(text, open_paren_pos + 1):
+            ch = token.group()
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                if depth == 0:
+                    close_paren_pos = token.start()
+                    break
+                depth -= 1
+            elif depth == 0 and first_arg_end == -1:
+                first_arg_end = token.start()
 
         if close_paren_pos == -1:
             break  # Malformed SQL, can't find closing paren
 
-        # Extract the first argument
-        first_arg = result[open_paren_pos + 1 : first_arg_end].strip()
+        if first_arg_end == -1:
+            first_arg_end = close_paren_pos
+
+        parts.append(text[pos : match.start()])
+        parts.append(
+            _strip_round_calls(text[open_paren_pos + 1 : first_arg_end].strip())
+        )
+        pos = close_paren_pos + 1
+
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
 
-        # Replace ROUND(...) with just the first argument
-        result = result[:start_pos] + first_arg + result[close_paren_pos + 1 :]
+
+def remove_round_functions(sql_string):
+    """
+    Remove all ROUND() function calls from a SQL string, including nested ones.
+    This regex properly handles nested functions with commas.
+    """
+    result = _strip_round_calls(sql_string)
+
+    # Stripping can join text into a new ROUND( (rare), so sweep until stable
+    while result is not sql_string and _ROUND_OPEN.search(result):
+        sql_string = result
+        result = _strip_round_calls(sql_string)
 
     return result
 
 
 def remove_round_functions_regex(sql_string):
-    pattern = r"ROUND\s*\(([^,()]*(?:\([^()]*\)[^,()]*)*?)(?:,[^)]*)?\)"
     while True:
-        new_result = re.sub(pattern, r"\1", sql_string, flags=re.IGNORECASE)
-        if new_result == sql_string:  # No more changes made
+        new_result, replaced = _ROUND_REGEX.subn(r"\1", sql_string)
+        if not replaced:  # No more changes made
             break
         sql_string = new_result
     return sql_string
@@ -109,35 +145,103 @@ def remove_round(sql_list):
     """
     cleaned = []
     for sql in sql_list:
-        result = sql
-        result = remove_round_functions(result)
+        if "round" not in sql.lower():
+            cleaned.append(sql)
+            continue
+        result = remove_round_functions(sql)
         cleaned.append(result)
         if "ROUND" in result:
             logging.warning(f"ROUND found in {result}")
     return cleaned
 
 
-def process_decimals_recursive(item, decimal_places):
+def _round_decimals(item, quantizer, decimal_places):
     """
-    Recursively process decimals in any data structure (list, dict, tuple).
-    Returns a new structure with all decimals rounded to specified places.
+    Round decimals anywhere in `item` using a precomputed quantizer, so nested
+    structures don't rebuild it for every node.
     """
-    quantizer = Decimal(1).scaleb(-decimal_places)
-
     if isinstance(item, Decimal):
-        return item.quantize(quantizer, rounding=ROUND_HALF_UP)
+        return item.quantize(quantizer, ROUND_HALF_UP)
     elif isinstance(item, float):
         return round(item, decimal_places)
     elif isinstance(item, (list, tuple)):
-        return type(item)(process_decimals_recursive(x, decimal_places) for x in item)
+        rounded = [_round_decimals(x, quantizer, decimal_places) for x in item]
+        return rounded if type(item) is list else type(item)(rounded)
     elif isinstance(item, dict):
         return {
-            k: process_decimals_recursive(v, decimal_places) for k, v in item.items()
+            k: _round_decimals(v, quantizer, decimal_places) for k, v in item.items()
         }
     else:
         return item
 
 
+def process_decimals_recursive(item, decimal_places):
+    """
+    Recursively process decimals in any data structure (list, dict, tuple).
+    Returns a new structure with all decimals rounded to specified places.
+    """
+    quantizer = Decimal(1).scaleb(-decimal_places)
+    return _round_decimals(item, quantizer, decimal_places)
+
+
+def _process_cell(item, quantizer, decimal_places):
+    """Fallback for cells that aren't one of the plain scalar types."""
+    if isinstance(item, (date, datetime)):
+        return item.strftime("%Y-%m-%d")
+    # Process decimals recursively first
+    processed_item = _round_decimals(item, quantizer, decimal_places)
+    if isinstance(processed_item, (dict, list)):
+        # Convert unhashable types to their string representation with sorted keys
+        return json.dumps(processed_item, sort_keys=True)
+    return processed_item
+
+
+# Cell types that preprocessing returns unchanged
+_PASSTHROUGH_TYPES = frozenset([str, int, bool, type(None)])
+# Result sets with more rows than this are processed column by column, so
+# all-float columns can be rounded with NumPy
+NUMPY_ROUND_MIN_ROWS = 512
+
+
+def _preprocess_cells(cells, quantizer, decimal_places):
+    """Preprocess a row or column of cells, returning a list."""
+    processed = []
+    append = processed.append
+    for item in cells:
+        # Plain scalars are handled inline on their exact type
+        item_type = type(item)
+        if item_type is Decimal:
+            append(item.quantize(quantizer, ROUND_HALF_UP))
+        elif item_type is float:
+            append(round(item, decimal_places))
+        elif item_type in _PASSTHROUGH_TYPES:
+            append(item)
+        elif item_type is date or item_type is datetime:
+            append(item.strftime("%Y-%m-%d"))
+        else:
+            append(_process_cell(item, quantizer, decimal_places))
+    return processed
+
+
+def _round_float_column(column, decimal_places):
+    """
+    Round a column of floats with NumPy, matching round() exactly: values that
+    scale to within 1e-6 of a .5 tie, or that are large or non-finite, are
+    redone with round() since rint() of the scaled value could differ there.
+    """
+    scale = 10.0**decimal_places
+    # inf/nan and overflowing values are redone below, so don't warn about them
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = np.fromiter(column, dtype=np.float64, count=len(column)) * scale
+        rounded = (np.rint(scaled) / scale).tolist()
+        redo = ~(np.abs(scaled) < 1e9) | (
+            np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        )
+    for i in np.flatnonzero(redo).tolist():
+        rounded[i] = round(column[i], decimal_places)
+    return rounded
+
+
 def preprocess_results(results, decimal_places=2):
     """
     Process the result set:
@@ -146,22 +250,47 @@ def preprocess_results(results, decimal_places=2):
     - Convert any unhashable types (dicts, lists) to their string representation for comparison
     - Process decimals recursively in all nested structures
     """
-    processed = []
-    for result in results:
-        processed_result = []
-        for item in result:
-            if isinstance(item, (date, datetime)):
-                processed_result.append(item.strftime("%Y-%m-%d"))
+    return list(_iter_preprocess(results, decimal_places))
+
+
+def _iter_preprocess(results, decimal_places=2):
+    """
+    Yield the rows of preprocess_results one at a time, so callers can build
+    the collection they compare with (list or set) without an extra copy.
+    """
+    quantizer = Decimal(1).scaleb(-decimal_places)
+
+    if (
+        type(results) is list
+        and len(results) > NUMPY_ROUND_MIN_ROWS
+        and results[0]
+        and 0 <= decimal_places <= 15
+    ):
+        columns = []
+        for column in zip(*results):
+            if all(type(item) is float for item in column):
+                columns.append(_round_float_column(column, decimal_places))
             else:
-                # Process decimals recursively first
-                processed_item = process_decimals_recursive(item, decimal_places)
-                if isinstance(processed_item, (dict, list)):
-                    # Convert unhashable types to their string representation with sorted keys
-                    processed_result.append(json.dumps(processed_item, sort_keys=True))
-                else:
-                    processed_result.append(processed_item)
-        processed.append(tuple(processed_result))
-    return processed
+                columns.append(_preprocess_cells(column, quantizer, decimal_places))
+        yield from zip(*columns)
+        return
+
+    for result in results:
+        yield tuple(_preprocess_cells(result, quantizer, decimal_places))
+
+
+def _drop_distinct(match):
+    """Drop a DISTINCT keyword unless it starts a DISTINCT ON clause."""
+    text = match.string
+    end = pos = match.end()
+    length = len(text)
+    while pos < length and text[pos].isspace():
+        pos += 1
+    if pos > end and text[pos : pos + 2].upper() == "ON":
+        after = pos + 2
+        if after == length or not (text[after].isalnum() or text[after] == "_"):
+            return match.group()
+    return ""
 
 
 def remove_distinct(sql_list):
@@ -181,9 +310,10 @@ def remove_distinct(sql_list):
 
     cleaned_queries = []
     for query in sql_list:
-        cleaned_queries.append(
-            re.sub(r"\bDISTINCT\b(?!\s+ON\b)", "", query, flags=re.IGNORECASE)
-        )
+        if "distinct" not in query.lower():
+            cleaned_queries.append(query)
+            continue
+        cleaned_queries.append(_DISTINCT_RE.sub(_drop_distinct, query))
 
     return cleaned_queries
 
@@ -204,18 +334,24 @@ def check_sql_function_usage(sqls, required_keywords):
     if not sqls:
         return 0
 
-    # Combine all SQL queries into one string and convert to lowercase
-    combined_sql = " ".join(sql.lower() for sql in sqls)
+    # Lowercase each query once and look for every keyword query by query
+    sqls_lower = [sql.lower() for sql in sqls]
+    combined_sql = None
 
-    # Check if all required keywords appear in combined_sql
     for kw in required_keywords:
-        if kw.lower() not in combined_sql:
+        kw_lower = kw.lower()
+        if any(kw_lower in sql for sql in sqls_lower):
+            continue
+        # A keyword can still span two queries in the space-joined text
+        if combined_sql is None:
+            combined_sql = " ".join(sqls_lower)
+        if kw_lower not in combined_sql:
             return 0
 
     return 1
 
 
-def ex_base(pred_sqls, sol_sqls, db_name, conn, conditions=None):
+def ex_base(pred_sqls, sol_sqls, db_name, conn, conditions=None, logger=None):
     """
     Compare result-sets of two lists of SQL queries:
     - Strip comments, DISTINCT, and ORDER BY
@@ -223,30 +359,33 @@ def ex_base(pred_sqls, sol_sqls, db_name, conn, conditions=None):
     - Normalize dates and optionally round decimals
     - Check equality (either ordered or unordered based on conditions)
     Return 1 on match, else 0.
+    Query logs go to `logger` (stdout when None).
     """
     if not pred_sqls or not sol_sqls:
         return 0
 
     # execute
     predicted_res, pred_err, pred_to = execute_queries(
-        pred_sqls, db_name, conn, None, ""
+        pred_sqls, db_name, conn, logger, ""
     )
-    ground_res, gt_err, gt_to = execute_queries(sol_sqls, db_name, conn, None, "")
+    ground_res, gt_err, gt_to = execute_queries(sol_sqls, db_name, conn, logger, "")
     if any([pred_err, pred_to, gt_err, gt_to]):
         return 0
 
-    predicted_res = preprocess_results(predicted_res)
-    ground_res = preprocess_results(ground_res)
-    if not predicted_res or not ground_res:
-        return 0
-
     # Check if we should compare with order
     if conditions is not None and conditions.get("order", False):
         # Compare as lists to preserve order
-        return 1 if predicted_res == ground_res else 0
+        predicted_res = list(_iter_preprocess(predicted_res))
+        ground_res = list(_iter_preprocess(ground_res))
     else:
-        # Default: compare as sets (order doesn't matter)
-        return 1 if set(predicted_res) == set(ground_res) else 0
+        # Default: compare as sets (order doesn't matter), built straight
+        # from the preprocessed rows
+        predicted_res = set(_iter_preprocess(predicted_res))
+        ground_res = set(_iter_preprocess(ground_res))
+    if not predicted_res or not ground_res:
+        return 0
+
+    return 1 if predicted_res == ground_res else 0
 
 
 def performance_compare_by_qep(old_sqls, sol_sqls, db_name, conn):
@@ -269,12 +408,122 @@ def performance_compare_by_qep(old_sqls, sol_sqls, db_name, conn):
     print(f"Old SQLs are {old_sqls}")
     print(f"New SQLs are {sol_sqls}")
 
+    # A plan cost only depends on the SQL and on the non-DML statements run
+    # before it. Each statement commits on its own, so the history spans both
+    # sides. Statements shared by old_sqls and sol_sqls are explained once
+    # when no non-DML ran in between.
+    explain_costs = {}
+    executed = ()
+
+    def explain_cost(sql):
+        """
+        EXPLAIN a single DML statement and return its 'Total Cost', or None if
+        the EXPLAIN failed.
+        """
+        explain_sql = f"EXPLAIN (FORMAT JSON) {sql}"
+        try:
+            result_rows, _ = perform_query_on_postgresql_databases(
+                explain_sql, db_name, conn=conn
+            )
+            if not result_rows:
+                print(f"[measure_sqls_cost] No result returned for EXPLAIN: {sql}")
+                return None
+
+            explain_json = result_rows[0][0]
+            try:
+                # psycopg2 already decodes json columns, so this is the usual case
+                return float(explain_json[0]["Plan"]["Total Cost"])
+            except (TypeError, KeyError, IndexError):
+                pass
+
+            if isinstance(explain_json, str):
+                if orjson is not None:
+                    explain_json = orjson.loads(explain_json)
+                else:
+                    explain_json = json.loads(explain_json)
+
+            if isinstance(explain_json, list) and len(explain_json) > 0:
+                plan_info = explain_json[0].get("Plan", {})
+                total_cost_part = plan_info.get("Total Cost", 0.0)
+            else:
+                print(
+                    f"[measure_sqls_cost] Unexpected EXPLAIN JSON format for {sql}, skip cost."
+                )
+                total_cost_part = 0.0
+
+            return float(total_cost_part)
+
+        except psycopg2.Error as e:
+            print(f"[measure_sqls_cost] psycopg2 Error on SQL '{sql}': {e}")
+        except Exception as e:
+            print(f"[measure_sqls_cost] Unexpected error on SQL '{sql}': {e}")
+        return None
+
+    def explain_costs_batch(sql_list):
+        """
+        EXPLAIN several DML statements in one round trip: a DO block runs each
+        EXPLAIN and reports its 'Total Cost' as a NOTICE. Returns the costs in
+        order, or None if the batch can't be used (any statement failing, SQL
+        that would break the dollar quoting, or notices not coming through).
+        """
+        if conn is None or any(
+            _PLAN_COST_SQL_TAG in sql or _PLAN_COST_DO_TAG in sql for sql in sql_list
+        ):
+            return None
+        steps = "".join(
+            f"EXECUTE {_PLAN_COST_SQL_TAG}EXPLAIN (FORMAT JSON) {sql}"
+            f"{_PLAN_COST_SQL_TAG} INTO plan; "
+            f"RAISE NOTICE 'lsb_plan_cost % %', {i}, "
+            "coalesce(plan->0->'Plan'->>'Total Cost', '0'); "
+            for i, sql in enumerate(sql_list)
+        )
+        do_sql = (
+            f"DO {_PLAN_COST_DO_TAG} DECLARE plan json; "
+            f"BEGIN {steps}END {_PLAN_COST_DO_TAG}"
+        )
+
+        notices = []
+        saved_notices = conn.notices
+        conn.notices = notices
+        try:
+            perform_query_on_postgresql_databases(do_sql, db_name, conn=conn)
+        except Exception:
+            return None
+        finally:
+            conn.notices = saved_notices
+
+        costs = {}
+        for notice in notices:
+            match = _PLAN_COST_NOTICE_RE.search(notice)
+            if match:
+                costs[int(match.group(1))] = float(match.group(2))
+        if len(costs) != len(sql_list):
+            return None
+        return [costs[i] for i in range(len(sql_list))]
+
     def measure_sqls_cost(sql_list):
         """
         Measure the sum of 'Total Cost' for each DML statement in sql_list
         via EXPLAIN (FORMAT JSON). Non-DML statements are just executed, but not included in the total cost.
+        Consecutive DML statements are explained together in one round trip.
         """
+        nonlocal executed
         total_cost = 0.0
+        pending = []
+
+        def flush_pending():
+            """EXPLAIN the queued DML statements, caching and summing their costs."""
+            costs = explain_costs_batch(pending) if len(pending) > 1 else None
+            if costs is None:
+                costs = [explain_cost(sql) for sql in pending]
+            cost_sum = 0.0
+            for sql, cost in zip(pending, costs):
+                if cost is not None:
+                    explain_costs[(executed, sql)] = cost
+                    cost_sum += cost
+            pending.clear()
+            return cost_sum
+
         for sql in sql_list:
             upper_sql = sql.strip().upper()
             # We only measure DML cost for SELECT/INSERT/UPDATE/DELETE
@@ -284,42 +533,23 @@ def performance_compare_by_qep(old_sqls, sol_sqls, db_name, conn):
                 or upper_sql.startswith("UPDATE")
                 or upper_sql.startswith("DELETE")
             ):
+                # Queued statements have to see the state before this one runs
+                total_cost += flush_pending()
                 print(f"[measure_sqls_cost] Skip EXPLAIN for non-DML: {sql}")
+                executed += (sql,)
                 try:
                     perform_query_on_postgresql_databases(sql, db_name, conn=conn)
                 except Exception as exc:
                     print(f"[measure_sqls_cost] Error executing non-DML '{sql}': {exc}")
                 continue
 
-            explain_sql = f"EXPLAIN (FORMAT JSON) {sql}"
-            try:
-                result_rows, _ = perform_query_on_postgresql_databases(
-                    explain_sql, db_name, conn=conn
-                )
-                if not result_rows:
-                    print(f"[measure_sqls_cost] No result returned for EXPLAIN: {sql}")
-                    continue
-
-                explain_json = result_rows[0][0]
-                if isinstance(explain_json, str):
-                    explain_json = json.loads(explain_json)
-
-                if isinstance(explain_json, list) and len(explain_json) > 0:
-                    plan_info = explain_json[0].get("Plan", {})
-                    total_cost_part = plan_info.get("Total Cost", 0.0)
-                else:
-                    print(
-                        f"[measure_sqls_cost] Unexpected EXPLAIN JSON format for {sql}, skip cost."
-                    )
-                    total_cost_part = 0.0
-
-                total_cost += float(total_cost_part)
-
-            except psycopg2.Error as e:
-                print(f"[measure_sqls_cost] psycopg2 Error on SQL '{sql}': {e}")
-            except Exception as e:
-                print(f"[measure_sqls_cost] Unexpected error on SQL '{sql}': {e}")
+            cache_key = (executed, sql)
+            if cache_key in explain_costs:
+                total_cost += explain_costs[cache_key]
+                continue
+            pending.append(sql)
 
+        total_cost += flush_pending()
         return total_cost
 
     # Measure cost for old_sqls
@@ -354,17 +584,20 @@ def remove_comments(sql_list):
     """
     cleaned = []
     for sql in sql_list:
-        # remove block comments
-        no_block = re.sub(r"/\*.*?\*/", "", sql, flags=re.DOTALL)
-        # remove line comments, keep newline
-        no_line = re.sub(r"--.*?(\r\n|\r|\n)", r"\1", no_block)
-        # collapse extra blank lines
-        no_blank = re.sub(r"\n\s*\n+", "\n", no_line)
-        cleaned.append(no_blank.strip())
+        if "/*" in sql and "-" in sql:
+            # Removing a block comment can create or swallow a "--", so keep
+            # the original order: block comments first, then line comments
+            sql = _LINE_COMMENT_RE.sub(r"\1", _BLOCK_COMMENT_RE.sub("", sql))
+        elif "--" in sql or "/*" in sql:
+            sql = _COMMENTS_RE.sub("", sql)
+        # collapse extra blank lines; a blank line needs at least two newlines
+        if sql.count("\n") > 1:
+            sql = _BLANK_LINES_RE.sub("\n", sql)
+        cleaned.append(sql.strip())
     return cleaned
 
 
-def test_case_default(pred_sqls, sol_sqls, db_name, conn, conditions):
+def test_case_default(pred_sqls, sol_sqls, db_name, conn, conditions, logger=None):
     """
     Default test_case: pytest-style assertion.
     """
@@ -376,7 +609,7 @@ def test_case_default(pred_sqls, sol_sqls, db_name, conn, conditions):
     sol_sqls = remove_distinct(sol_sqls)
     sol_sqls = remove_round(sol_sqls)
 
-    result = ex_base(pred_sqls, sol_sqls, db_name, conn, conditions)
+    result = ex_base(pred_sqls, sol_sqls, db_name, conn, conditions, logger=logger)
     assert result == 1, f"ex_base returned {result} but expected 1."
     return result
 
@@ -3,13 +3,41 @@ import sys
 import json
 import re
 
+try:
+    import orjson
+except ImportError:  # optional, several times faster than the stdlib json
+    orjson = None
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def json_dumps_line(obj):
+    """
+    Serialize obj as one JSONL line (bytes, including the trailing newline).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # e.g. Decimal values or non-str keys, which only json handles
+            pass
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+def load_jsonl_iter(file_path):
+    """
+    Yields one dict per non-blank line of the JSONL file at file_path.
+    """
+    with open(file_path, "rb") as file:
+        for line in file:
+            if line.strip():
+                yield _json_loads(line)
+
 def load_jsonl(file_path):
     """
     Loads JSONL data from file_path and returns a list of dicts.
     """
     try:
-        with open(file_path, "r") as file:
-            return [json.loads(line) for line in file]
+        return list(load_jsonl_iter(file_path))
     except Exception as e:
         print(f"Failed to load JSONL file: {e}")
         sys.exit(1)
@@ -48,18 +76,21 @@ def save_report_and_status(report_file_path,
     total_instances = len(data_list)
     try:
         with open(report_file_path, "w") as report_file:
-            report_file.write("--------------------------------------------------\n")
-            report_file.write("BIRD-Interact Statistics (Postgres, Multi-Thread):\n")
-            report_file.write(f"Number of Instances: {total_instances}\n")
-            report_file.write(f"Number of Execution Errors: {number_of_execution_errors}\n")
-            report_file.write(f"Number of Timeouts: {number_of_timeouts}\n")
-            report_file.write(f"Number of Assertion Errors: {number_of_assertion_errors}\n")
             total_errors = (number_of_execution_errors
                             + number_of_timeouts
                             + number_of_assertion_errors)
-            report_file.write(f"Total Errors: {total_errors}\n")
-            report_file.write(f"Overall Accuracy: {overall_accuracy:.2f}%\n")
-            report_file.write(f"Timestamp: {timestamp}\n\n")
+            # Collect the whole report and write it out in one call
+            parts = [
+                "--------------------------------------------------\n",
+                "BIRD-Interact Statistics (Postgres, Multi-Thread):\n",
+                f"Number of Instances: {total_instances}\n",
+                f"Number of Execution Errors: {number_of_execution_errors}\n",
+                f"Number of Timeouts: {number_of_timeouts}\n",
+                f"Number of Assertion Errors: {number_of_assertion_errors}\n",
+                f"Total Errors: {total_errors}\n",
+                f"Overall Accuracy: {overall_accuracy:.2f}%\n",
+                f"Timestamp: {timestamp}\n\n",
+            ]
 
             print(f"Overall Accuracy: {overall_accuracy:.2f}%\n")
 
@@ -80,7 +111,7 @@ def save_report_and_status(report_file_path,
                 if q_res.get("evaluation_phase_assertion_error"):
                     eval_phase_note += " | Eval Phase: Assertion Error"
 
-                report_file.write(
+                parts.append(
                     f"Question_{q_idx}: ({t_pass}/{t_total}) test cases passed, "
                     f"failed test cases: {failed_list_str}{eval_phase_note}\n"
                 )
@@ -96,5 +127,7 @@ def save_report_and_status(report_file_path,
                         data_list[i]['error_message'] = f"{failed_list_str} failed"
                     else:
                         data_list[i]['error_message'] = eval_phase_note
+
+            report_file.write("".join(parts))
     except Exception as e:
         big_logger.error(f"Failed to write report: {e}")
\ No newline at end of file
@@ -0,0 +1,140 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from db_utils import _can_batch, _run_committed_batch, perform_query_on_cursor
+
+
+class _FakeCursor:
+    def __init__(self, connection, name=None):
+        self.connection = connection
+        self.name = name
+        self.itersize = 2000
+        self.executed = []
+
+    def execute(self, query):
+        self.executed.append(query)
+
+    def fetchmany(self, size):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class _FakeInfo:
+    transaction_status = TRANSACTION_STATUS_IDLE
+
+
+class _FakeConnection:
+    """Connection stand-in that rejects named cursors in autocommit like psycopg2."""
+
+    def __init__(self, autocommit):
+        self.autocommit = autocommit
+        self.closed = 0
+        self.info = _FakeInfo()
+        self.named_cursors = []
+        self.commits = 0
+
+    def cursor(self, name=None):
+        if name is not None:
+            if self.autocommit:
+                raise psycopg2.ProgrammingError(
+                    "can't use a named cursor outside of transactions"
+                )
+            self.named_cursors.append(name)
+        return _FakeCursor(self, name)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class PerformQueryOnCursorTest(unittest.TestCase):
+    def test_select_in_autocommit_uses_plain_cursor(self):
+        conn = _FakeConnection(autocommit=True)
+        cursor = conn.cursor()
+        rows = perform_query_on_cursor(cursor, "SELECT 1")
+        self.assertEqual(rows, [(1,)])
+        self.assertEqual(conn.named_cursors, [])
+        self.assertEqual(cursor.executed, ["SELECT 1"])
+        self.assertTrue(conn.autocommit)
+
+    def test_select_runs_in_autocommit(self):
+        conn = _FakeConnection(autocommit=False)
+        autocommit_during_execute = []
+        cursor = conn.cursor()
+        cursor.execute = lambda query: autocommit_during_execute.append(conn.autocommit)
+        perform_query_on_cursor(cursor, "SELECT 1")
+        self.assertEqual(autocommit_during_execute, [True])
+        self.assertEqual(conn.named_cursors, [])
+        self.assertEqual(conn.commits, 0)
+        self.assertFalse(conn.autocommit)
+
+    def test_write_is_committed(self):
+        conn = _FakeConnection(autocommit=False)
+        cursor = conn.cursor()
+        perform_query_on_cursor(cursor, "UPDATE t SET a = 1")
+        self.assertEqual(cursor.executed, ["UPDATE t SET a = 1"])
+        self.assertEqual(conn.commits, 1)
+        self.assertFalse(conn.autocommit)
+
+
+class _FailingBatchCursor(_FakeCursor):
+    """Fails the batch after the given number of committed statements."""
+
+    def __init__(self, connection, committed):
+        super().__init__(connection)
+        self.committed = committed
+
+    def execute(self, query):
+        self.executed.append(query)
+        if len(self.executed) == 1:
+            raise psycopg2.errors.QueryCanceled("canceling statement")
+
+    def fetchone(self):
+        return (str(self.committed),)
+
+
+class CommittedBatchTest(unittest.TestCase):
+    def test_can_batch(self):
+        self.assertTrue(_can_batch(["INSERT INTO t VALUES (1);", "SELECT 1"]))
+        self.assertFalse(_can_batch(["BEGIN", "SELECT 1"]))
+        self.assertFalse(_can_batch(["SELECT 1; SELECT 2"]))
+        self.assertFalse(_can_batch(["INSERT INTO t VALUES (now())", "SELECT 1"]))
+        self.assertFalse(_can_batch(["SELECT 'today'::date", "SELECT 1"]))
+
+    def test_each_statement_is_committed(self):
+        conn = _FakeConnection(autocommit=False)
+        cursor = conn.cursor()
+        rows, failure = _run_committed_batch(cursor, ["UPDATE t SET a = 1;", "SELECT 1"])
+        self.assertEqual(rows, [(1,)])
+        self.assertIsNone(failure)
+        self.assertEqual(len(cursor.executed), 1)
+        statements = cursor.executed[0].split("\n;\n")
+        self.assertEqual(statements[1], "COMMIT")
+        self.assertEqual(statements[2], "UPDATE t SET a = 1")
+        self.assertEqual(statements[4], "COMMIT")
+        self.assertEqual(statements[5], "SELECT 1")
+        self.assertFalse(conn.autocommit)
+
+    def test_failure_reports_failing_statement(self):
+        conn = _FakeConnection(autocommit=False)
+        cursor = _FailingBatchCursor(conn, committed=1)
+        rows, failure = _run_committed_batch(cursor, ["SELECT 1", "SELECT 2", "SELECT 3"])
+        self.assertIsNone(rows)
+        self.assertEqual(failure[0], 1)
+        self.assertIsInstance(failure[1], psycopg2.errors.QueryCanceled)
+        # Nothing is replayed after the failure
+        self.assertEqual(len(cursor.executed), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()